@@ -5,8 +5,13 @@ Backup puzzle training data from Supabase to a JSON file.
 Dumps the current Supabase training metadata for a puzzle into
 backups/{puzzle_number}.json. Commit the file to git for version history.
 
+With --emit-binary, also writes backups/{puzzle_number}.msgpack (requires the
+msgpack package). restore_puzzle.py reads the .msgpack file when it is at least
+as new as the JSON.
+
 Usage:
     python3 backup_puzzle.py --puzzle 29453
+    python3 backup_puzzle.py --puzzle 29453 --emit-binary
 """
 
 import json
@@ -17,12 +22,23 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from puzzle_store_supabase import PuzzleStoreSupabase
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 
-def backup_puzzle(puzzle_number):
+def backup_puzzle(puzzle_number, emit_binary=False):
     """Backup a puzzle's training data from Supabase to backups/{puzzle_number}.json.
 
+    With emit_binary, also writes backups/{puzzle_number}.msgpack.
     Returns the number of clues backed up, or -1 on error.
     """
+    if emit_binary and not MSGPACK_AVAILABLE:
+        print("ERROR: --emit-binary requires the msgpack package. Run: pip install msgpack")
+        return -1
+
     store = PuzzleStoreSupabase()
     all_items = store.get_training_clues()
 
@@ -43,12 +59,20 @@ def backup_puzzle(puzzle_number):
         json.dump({"training_items": puzzle_items}, f, indent=2)
 
     print(f"Backed up {len(puzzle_items)} clues to backups/{puzzle_number}.json")
+
+    if emit_binary:
+        binary_path = os.path.join(backups_dir, f'{puzzle_number}.msgpack')
+        with open(binary_path, 'wb') as f:
+            f.write(msgpack.packb({"training_items": puzzle_items}, use_bin_type=True))
+        print(f"Backed up {len(puzzle_items)} clues to backups/{puzzle_number}.msgpack")
+
     return len(puzzle_items)
 
 
 def main():
     if '--puzzle' not in sys.argv:
         print("Usage: python3 backup_puzzle.py --puzzle 29453")
+        print("       python3 backup_puzzle.py --puzzle 29453 --emit-binary")
         return 1
 
     idx = sys.argv.index('--puzzle')
@@ -57,7 +81,7 @@ def main():
         return 1
 
     puzzle_number = sys.argv[idx + 1]
-    result = backup_puzzle(puzzle_number)
+    result = backup_puzzle(puzzle_number, emit_binary='--emit-binary' in sys.argv)
     return 0 if result > 0 else 1
 
 
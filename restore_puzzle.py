@@ -2,12 +2,14 @@
 """
 Restore puzzle training data from a backup JSON file to Supabase.
 
-Reads backups/{puzzle_number}.json and uploads each clue's training
-metadata back to Supabase. The puzzle must be unlocked first.
+Reads backups/{puzzle_number}.json (or the .msgpack written by
+backup_puzzle.py --emit-binary, when it is at least as new as the JSON) and
+uploads each clue's training metadata back to Supabase. The puzzle must be unlocked first.
 
 Usage:
     python3 restore_puzzle.py --puzzle 29453
     python3 restore_puzzle.py --puzzle 29453 --dry-run
+    python3 restore_puzzle.py --puzzle 29453 --dry-run-first
 """
 
 import json
@@ -19,14 +21,96 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from puzzle_store_supabase import PuzzleStoreSupabase
 from upload_training_metadata import parse_training_id, extract_metadata
+from backup_puzzle import MSGPACK_AVAILABLE
+
+if MSGPACK_AVAILABLE:
+    import msgpack
+
+
+def load_backup(puzzle_number):
+    """Load a puzzle backup from JSON, or from its .msgpack copy if that is current.
+
+    The JSON is the file of record (git-tracked); the .msgpack is derived from
+    it and only used when its mtime is at least the JSON's, so a stale binary
+    never shadows an edited, reverted or pulled JSON.
+    Returns (data, filename), or (None, None) if no backup exists.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backups_dir = os.path.join(script_dir, 'backups')
+    backup_path = os.path.join(backups_dir, f'{puzzle_number}.json')
+    binary_path = os.path.join(backups_dir, f'{puzzle_number}.msgpack')
+
+    if not os.path.exists(backup_path):
+        return None, None
+
+    if MSGPACK_AVAILABLE and os.path.exists(binary_path) \
+            and os.path.getmtime(binary_path) >= os.path.getmtime(backup_path):
+        with open(binary_path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False), f'{puzzle_number}.msgpack'
+
+    with open(backup_path, 'r') as f:
+        return json.load(f), f'{puzzle_number}.json'
+
+
+def parse_items(training_items):
+    """Parse every backup item once.
+
+    Returns (parsed, errors): parsed maps item_id -> (parsed_id, metadata)
+    and is reused by every restore pass; errors lists items that failed to parse.
+    """
+    parsed = {}
+    errors = []
+    for item_id, item in training_items.items():
+        try:
+            # No validation — backup data comes from Supabase (already validated).
+            # The DB clue text includes the enumeration which doesn't match the
+            # words array, so validation would always fail on restored data.
+            parsed[item_id] = (parse_training_id(item_id), extract_metadata(item))
+        except Exception as e:
+            errors.append(f"{item_id}: {e}")
+            print(f"  ✗ {item_id}: {e}")
+    return parsed, errors
+
+
+def restore_items(store, parsed, dry_run):
+    """Run one restore pass over pre-parsed items. Returns (success, errors)."""
+    success = 0
+    errors = []
+
+    for item_id, ((publication, pn, clue_number, direction), metadata) in parsed.items():
+        try:
+            dir_label = f"{clue_number}{'A' if direction == 'across' else 'D'}"
+
+            if dry_run:
+                step_count = len(metadata.get('steps', []))
+                print(f"  {dir_label}: {len(metadata)} fields, {step_count} steps")
+            else:
+                store.save_training_metadata(
+                    series=publication,
+                    puzzle_number=pn,
+                    clue_number=clue_number,
+                    direction=direction,
+                    metadata=metadata
+                )
+                print(f"  ✓ {dir_label}")
+
+            success += 1
+
+        except Exception as e:
+            errors.append(f"{item_id}: {e}")
+            print(f"  ✗ {item_id}: {e}")
+
+    return success, errors
 
 
 def main():
+    dry_run_first = '--dry-run-first' in sys.argv
     dry_run = '--dry-run' in sys.argv
 
     if '--puzzle' not in sys.argv:
         print("Usage: python3 restore_puzzle.py --puzzle 29453")
         print("       python3 restore_puzzle.py --puzzle 29453 --dry-run")
+        print("       python3 restore_puzzle.py --puzzle 29453 --dry-run-first")
         return 1
 
     idx = sys.argv.index('--puzzle')
@@ -37,22 +121,17 @@ def main():
     puzzle_number = sys.argv[idx + 1]
 
     # Load backup file
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    backup_path = os.path.join(script_dir, 'backups', f'{puzzle_number}.json')
-
-    if not os.path.exists(backup_path):
+    data, backup_name = load_backup(puzzle_number)
+    if data is None:
         print(f"ERROR: No backup found at backups/{puzzle_number}.json")
         return 1
 
-    with open(backup_path, 'r') as f:
-        data = json.load(f)
-
     training_items = data.get('training_items', {})
     if not training_items:
         print(f"ERROR: Backup file is empty")
         return 1
 
-    print(f"Loaded {len(training_items)} clues from backups/{puzzle_number}.json")
+    print(f"Loaded {len(training_items)} clues from backups/{backup_name}")
 
     if dry_run:
         print("\n=== DRY RUN — no changes will be written ===\n")
@@ -69,39 +148,20 @@ def main():
         print(f"  python3 lock_puzzle.py --unlock {puzzle_number}")
         return 1
 
-    success = 0
-    failed = 0
-    errors = []
-
-    for item_id, item in training_items.items():
-        try:
-            # No validation — backup data comes from Supabase (already validated).
-            # The DB clue text includes the enumeration which doesn't match the
-            # words array, so validation would always fail on restored data.
-            publication, pn, clue_number, direction = parse_training_id(item_id)
-            metadata = extract_metadata(item)
-
-            dir_label = f"{clue_number}{'A' if direction == 'across' else 'D'}"
-
-            if dry_run:
-                step_count = len(metadata.get('steps', []))
-                print(f"  {dir_label}: {len(metadata)} fields, {step_count} steps")
-            else:
-                store.save_training_metadata(
-                    series=publication,
-                    puzzle_number=pn,
-                    clue_number=clue_number,
-                    direction=direction,
-                    metadata=metadata
-                )
-                print(f"  ✓ {dir_label}")
+    # Parse once — both passes of --dry-run-first reuse the same results
+    parsed, parse_errors = parse_items(training_items)
 
-            success += 1
+    if dry_run_first and not dry_run:
+        print("\n=== DRY RUN — checking before restore ===\n")
+        _, dry_errors = restore_items(store, parsed, dry_run=True)
+        if parse_errors or dry_errors:
+            print(f"\nDry run found {len(parse_errors) + len(dry_errors)} error(s) — nothing restored.")
+            return 1
+        print("\n=== Restoring ===\n")
 
-        except Exception as e:
-            failed += 1
-            errors.append(f"{item_id}: {e}")
-            print(f"  ✗ {item_id}: {e}")
+    success, errors = restore_items(store, parsed, dry_run)
+    errors = parse_errors + errors
+    failed = len(errors)
 
     print(f"\n=== Summary ===")
     print(f"Restored: {success}")
@@ -10,17 +10,38 @@ via /trainer/clue-ids?full=1 — no hardcoded clue lists.
 Usage:
     python3 test_regression.py
     python3 test_regression.py --server http://127.0.0.1:8080
+    python3 test_regression.py --server unix:///tmp/trainer.sock
+    python3 test_regression.py --workers 4
+    python3 test_regression.py --no-cache
+    python3 test_regression.py --fail-fast-per-clue
 
 Requires: a running crossword_server.py instance.
-Dependencies: stdlib only (urllib).
+Dependencies: stdlib only (http.client). Uses orjson for request and
+response bodies when it is installed.
 """
 
+import argparse
+import concurrent.futures
+import copy
+import functools
+import gzip
+import hashlib
+import http.client
+import io
+import itertools
 import json
 import os
 import re
+import socket
 import sys
-import urllib.request
-import urllib.error
+import threading
+import urllib.parse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -28,46 +49,206 @@ import urllib.error
 
 DEFAULT_SERVER = "http://127.0.0.1:8080"
 
+# Clues are independent, so they run concurrently; each worker walks one clue's
+# tests sequentially. Pin lower with --workers if the server can't keep up.
+MAX_WORKERS = 32
+
+# Revalidated copy of the clue catalog (see fetch_clue_catalog)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".regression_cache")
+
+# Bytes of a non-JSON error page kept for failure messages
+_ERROR_BODY_LIMIT = 512
+
 # Import from shared constants — single source of truth
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from training_constants import DEPENDENT_TRANSFORM_TYPES
 
+# JSON codec for request/response bodies — both work on bytes, no str round-trip
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _json_loads = json.loads
+
+# Patterns used per clue / per step — compiled once
+_NON_ALPHA_RE = re.compile(r'[^A-Za-z]')
+_NON_UPPER_RE = re.compile(r'[^A-Z]')
+_WORD_SPLIT_RE = re.compile(r'[\s-]+')
+# Phrases only the generic dependent-transform prompt templates use (vs per-clue overrides)
+_TEMPLATE_MARKER_RE = re.compile("|".join(re.escape(m) for m in (
+    "tells you to reverse", "tells you to shorten",
+    "rearrange those letters",
+    "tells you one piece goes inside another",
+)))
+# "[type] indicator" labels the indicator completion template already prefixes
+_INDICATOR_LABEL_RE = re.compile("|".join(re.escape(label) for label in (
+    "deletion indicator", "reversal indicator", "container indicator",
+    "anagram indicator", "ordering indicator", "letter selection indicator",
+    "hidden word indicator",
+)))
+
+
+@functools.lru_cache(maxsize=4096)
+def _word_pattern(word):
+    """Compiled whole-word pattern for word (answers recur across tests)."""
+    return re.compile(r'\b' + re.escape(word) + r'\b')
+
+
 # ---------------------------------------------------------------------------
 # HTTP helpers
 # ---------------------------------------------------------------------------
 
+# Keep-alive connections, one per (scheme, host, port) — reused by every request
+# instead of paying a TCP handshake per call. Per-thread, because http.client
+# connections are not thread-safe and clues run on a worker pool.
+_CONN_LOCAL = threading.local()
+
+
+def _conn_pool():
+    """Return this thread's {(scheme, host, port): connection} pool."""
+    pool = getattr(_CONN_LOCAL, "pool", None)
+    if pool is None:
+        pool = _CONN_LOCAL.pool = {}
+    return pool
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a Unix domain socket — for --server unix:///path/to.sock."""
+
+    def __init__(self, socket_path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def _get_conn(server):
+    """Return (key, connection) for server, opening a pooled connection on first use."""
+    parts = urllib.parse.urlsplit(server)
+    key = (parts.scheme, parts.hostname or parts.path, parts.port)
+    pool = _conn_pool()
+    conn = pool.get(key)
+    if conn is None:
+        if parts.scheme == "unix":
+            conn = UnixHTTPConnection(parts.path, timeout=30)
+        elif parts.scheme == "https":
+            conn = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=30)
+        else:
+            # Skip the resolver (and an IPv6 ::1 attempt) for the usual local dev server
+            host = "127.0.0.1" if parts.hostname == "localhost" else parts.hostname
+            conn = http.client.HTTPConnection(host, parts.port, timeout=30)
+        pool[key] = conn
+    return key, conn
+
+
+def _raw_request(server, method, path, body=None, headers=None):
+    """Send a request over the pooled connection. Returns (status, body bytes, response headers).
+
+    Asks for gzip (render payloads compress well; hosted deployments honour it)
+    and decompresses transparently. If the server has dropped the idle
+    keep-alive socket, reconnects and retries once. Any failure closes the
+    connection and drops it from the pool, so a timeout or short read can't
+    leave this thread's connection stuck mid-request.
+    """
+    headers = {"Connection": "keep-alive", "Accept-Encoding": "gzip", **(headers or {})}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+    for attempt in (1, 2):
+        key, conn = _get_conn(server)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except Exception as e:
+            conn.close()
+            del _conn_pool()[key]
+            if attempt == 2 or not isinstance(e, (http.client.BadStatusLine, ConnectionError)):
+                raise
+            continue
+        if resp.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return resp.status, data, resp.headers
+
+
+def _request(server, method, path, body=None):
+    """Send a /trainer request. Returns (status, parsed JSON body)."""
+    status, data, _ = _raw_request(server, method, f"/trainer{path}", body)
+    try:
+        return status, _json_loads(data)
+    except ValueError:
+        # Non-JSON error pages (e.g. a 404 from a server without the route);
+        # only the start is kept so HTML tracebacks don't flood failure messages
+        if status == 200:
+            raise
+        return status, {"error": data[:_ERROR_BODY_LIMIT].decode("utf-8", "replace")}
+
+
 def api_get(server, path):
     """GET JSON from server, return parsed response."""
-    url = f"{server}/trainer{path}"
-    req = urllib.request.Request(url)
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    status, body = _request(server, "GET", path)
+    if status != 200:
+        raise RuntimeError(f"GET {path} failed ({status}): {body}")
+    return body
+
+
+def fetch_clue_catalog(server, use_cache=True):
+    """GET /trainer/clue-ids?full=1, revalidating a copy kept in CACHE_DIR.
+
+    The server still reads Supabase on every call; when the catalog's ETag is
+    unchanged it answers 304 and the cached body is used instead of re-sending it.
+    The cache file holds the ETag on its first line and the JSON body after it.
+    """
+    cache_path = os.path.join(
+        CACHE_DIR, f"catalog-{hashlib.blake2b(server.encode('utf-8'), digest_size=8).hexdigest()}.json"
+    )
+    cached_etag = cached_body = None
+    if use_cache:
+        try:
+            with open(cache_path, "rb") as f:
+                cached_etag, _, cached_body = f.read().partition(b"\n")
+        except FileNotFoundError:
+            pass
+
+    path = "/clue-ids?full=1"
+    headers = {"If-None-Match": cached_etag.decode("utf-8")} if cached_etag else None
+    status, data, resp_headers = _raw_request(server, "GET", f"/trainer{path}", headers=headers)
+    if status == 304 and cached_body is not None:
+        data = cached_body
+    elif status != 200:
+        raise RuntimeError(f"GET {path} failed ({status}): {data.decode('utf-8', 'replace')}")
+    elif use_cache and resp_headers.get("ETag"):
+        _write_atomic(cache_path, resp_headers["ETag"].encode("utf-8") + b"\n" + data)
+    return _json_loads(data)["clues"]
 
 
 def api_post(server, path, payload):
     """POST JSON to server, return parsed response and status code."""
-    url = f"{server}/trainer{path}"
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
-    try:
-        with urllib.request.urlopen(req) as resp:
-            body = json.loads(resp.read().decode("utf-8"))
-            return resp.status, body
-    except urllib.error.HTTPError as e:
-        body = json.loads(e.read().decode("utf-8"))
-        return e.code, body
+    return _request(server, "POST", path, _json_dumps(payload))
 
 
 def start_session(server, clue):
-    """Start a training session, return render dict."""
-    status, body = api_post(server, "/start", {
-        "puzzle_number": clue["puzzle_number"],
-        "clue_number": clue["clue_number"],
-        "direction": clue["direction"],
-    })
-    if status != 200:
-        raise RuntimeError(f"Start failed ({status}): {body}")
-    return body
+    """Start a training session, return render dict.
+
+    Sessions are client-carried, so a fresh start is the same render every time:
+    the first /start per clue is kept on the clue and later calls get a private copy.
+    """
+    initial = clue.get("_initial_render")
+    if initial is None:
+        status, body = api_post(server, "/start", {
+            "puzzle_number": clue["puzzle_number"],
+            "clue_number": clue["clue_number"],
+            "direction": clue["direction"],
+        })
+        if status != 200:
+            raise RuntimeError(f"Start failed ({status}): {body}")
+        clue["_initial_render"] = initial = body
+    return copy.deepcopy(initial)
 
 
 def _session(render):
@@ -113,10 +294,48 @@ def reveal(server, clue_id, render):
     return body
 
 
+def api_post_batch(server, clue_id, render, ops):
+    """Apply ops ([{path, payload}]) to the session in render with one /batch request.
+
+    Returns the per-op response bodies.
+    """
+    status, body = api_post(server, "/batch", {"clue_id": clue_id, "session": _session(render), "ops": ops})
+    if status != 200:
+        raise RuntimeError(f"Batch failed ({status}): {body}")
+    return body["results"]
+
+
+def submit_step_values(server, clue_id, steps, render):
+    """Submit each step's correct value in one batch. Returns ([correct per step], final render)."""
+    if not steps:
+        return [], render
+    ops = [{"path": "/input", "payload": {"value": step["value"]}} for step in steps]
+    results = api_post_batch(server, clue_id, render, ops)
+    return [r["correct"] for r in results], results[-1]["render"]
+
+
 # ---------------------------------------------------------------------------
 # Build clue test data from live metadata
 # ---------------------------------------------------------------------------
 
+# Metadata step types answered by tapping clue words (their "indices" are the value)
+_TAP_WORDS_STEP_TYPES = frozenset((
+    "definition", "indicator", "outer_word", "inner_word", "fodder",
+    "multi_definition", "abbreviation_scan",
+))
+
+
+def _compute_hidden(transforms):
+    """Indices of assembly transforms hidden from display: source transforms consumed by substitution.
+
+    Every non-dependent transform before a substitution is consumed, so only the
+    last substitution matters.
+    """
+    last_sub = max((i for i, t in enumerate(transforms) if t.get("type") == "substitution"), default=0)
+    return frozenset(j for j in range(last_sub)
+                     if transforms[j].get("type") not in DEPENDENT_TRANSFORM_TYPES)
+
+
 def build_clue_test_data(clue_id, metadata):
     """Build the test data dict for a clue from its Supabase metadata.
 
@@ -124,38 +343,42 @@ def build_clue_test_data(clue_id, metadata):
     assembly info, wrong values, etc.
     """
     # Parse clue_id: "times-29147-21d" -> puzzle_number="29147", clue_number="21", direction="down"
-    parts = clue_id.split("-")
-    puzzle_number = parts[1]
-    suffix = parts[2]  # e.g. "21d"
-    match = re.match(r'^(\d+)([ad])$', suffix)
-    if not match:
+    head, _, suffix = clue_id.rpartition("-")  # suffix e.g. "21d"
+    puzzle_number = head.rpartition("-")[2]
+    clue_number, dir_char = suffix[:-1], suffix[-1:]
+    if dir_char not in ("a", "d") or not clue_number.isdigit():
         raise ValueError(f"Cannot parse clue_id '{clue_id}'")
-    clue_number = match.group(1)
-    direction = "across" if match.group(2) == "a" else "down"
+    direction = "across" if dir_char == "a" else "down"
 
     steps_meta = metadata.get("steps", [])
     words = metadata.get("words", [])
 
-    # Build step values for walkthrough
+    # One pass over the metadata steps: bucket them by type (used here and by
+    # the tests), build the walkthrough step values, and collect assembly info
+    steps_by_type = {}
     step_values = []
+    num_transforms = 0
+    dependent_indices = []
+    is_container = False
     for step in steps_meta:
         step_type = step["type"]
+        steps_by_type.setdefault(step_type, []).append(step)
         if step_type == "assembly":
             transforms = step.get("transforms", [])
-            # Identify hidden transforms: source transforms consumed by substitution
-            has_sub = any(t.get("type") == "substitution" for t in transforms)
-            hidden = set()
-            if has_sub:
-                for i, t in enumerate(transforms):
-                    if t.get("type") == "substitution" and i > 0:
-                        for j in range(i):
-                            if transforms[j].get("type") not in DEPENDENT_TRANSFORM_TYPES:
-                                hidden.add(j)
-            transform_entries = [{"index": i, "value": t["result"]}
-                                 for i, t in enumerate(transforms) if i not in hidden]
+            hidden = _compute_hidden(transforms)
+            transform_entries = []
+            for i, t in enumerate(transforms):
+                if i in hidden:
+                    continue
+                transform_entries.append({"index": i, "value": t["result"]})
+                t_type = t.get("type")
+                if t_type in DEPENDENT_TRANSFORM_TYPES:
+                    dependent_indices.append(i)
+                if t_type == "container":
+                    is_container = True
+            num_transforms = len(transform_entries)
             step_values.append({"type": "assembly", "inputMode": "assembly", "transforms": transform_entries})
-        elif step_type in ("definition", "indicator", "outer_word", "inner_word", "fodder",
-                           "multi_definition", "abbreviation_scan"):
+        elif step_type in _TAP_WORDS_STEP_TYPES:
             step_values.append({"type": step_type, "inputMode": "tap_words", "value": step["indices"]})
         elif step_type == "wordplay_type":
             step_values.append({"type": step_type, "inputMode": "multiple_choice", "value": step["expected"]})
@@ -166,7 +389,7 @@ def build_clue_test_data(clue_id, metadata):
     first_step = steps_meta[0] if steps_meta else {}
     if "indices" in first_step:
         def_indices = set(first_step["indices"])
-        wrong = [i for i in range(len(words)) if i not in def_indices][:2]
+        wrong = list(itertools.islice((i for i in range(len(words)) if i not in def_indices), 2))
         if not wrong:
             wrong = [0] if 0 not in def_indices else [1]
     elif "expected" in first_step:
@@ -177,114 +400,160 @@ def build_clue_test_data(clue_id, metadata):
         wrong = [0]
 
     # Indicator info
-    indicator_types = []
-    has_indicator_steps = False
-    for step in steps_meta:
-        if step["type"] == "indicator":
-            has_indicator_steps = True
-            indicator_types.append(step.get("indicator_type", ""))
+    indicator_steps = steps_by_type.get("indicator", [])
+    has_indicator_steps = bool(indicator_steps)
+    indicator_types = [step.get("indicator_type", "") for step in indicator_steps]
 
-    # Assembly info
-    num_transforms = 0
-    dependent_indices = []
-    is_container = False
-    for step in steps_meta:
-        if step["type"] == "assembly":
-            transforms = step.get("transforms", [])
-            # Compute hidden transforms (same logic as above)
-            has_sub = any(t.get("type") == "substitution" for t in transforms)
-            hidden_transforms = set()
-            if has_sub:
-                for i, t in enumerate(transforms):
-                    if t.get("type") == "substitution" and i > 0:
-                        for j in range(i):
-                            if transforms[j].get("type") not in DEPENDENT_TRANSFORM_TYPES:
-                                hidden_transforms.add(j)
-            num_transforms = len(transforms) - len(hidden_transforms)
-            for i, t in enumerate(transforms):
-                if i in hidden_transforms:
-                    continue
-                if t.get("type") in DEPENDENT_TRANSFORM_TYPES:
-                    dependent_indices.append(i)
-                if t.get("type") == "container":
-                    is_container = True
+    answer = _NON_ALPHA_RE.sub('', metadata.get("answer", ""))
 
     return {
         "id": clue_id,
         "puzzle_number": puzzle_number,
         "clue_number": clue_number,
         "direction": direction,
-        "answer": re.sub(r'[^A-Za-z]', '', metadata.get("answer", "")),
+        "answer": answer,
+        "answer_letters": len(_NON_UPPER_RE.sub('', answer)),
         "answer_raw": metadata.get("answer", ""),
         "enumeration": metadata.get("enumeration", ""),
         "words": words,
         "steps": step_values,
+        "assembly_step": next((sv for sv in step_values if sv["inputMode"] == "assembly"), None),
         "steps_meta": steps_meta,  # raw metadata for indicator_coverage etc.
+        "steps_by_type": steps_by_type,  # steps_meta bucketed by step type
+        # Per abbreviation_scan step (same order): mappings as [word index, letters]
+        # pairs — int keys parsed once, and pairs survive the JSON test-data cache
+        "abbreviation_mappings": [
+            [[int(k), v] for k, v in step.get("mappings", {}).items()]
+            for step in steps_by_type.get("abbreviation_scan", [])
+        ],
         "wrong_value_step0": wrong,
         "has_indicator_steps": has_indicator_steps,
         "indicator_types": indicator_types,
         "num_assembly_transforms": num_transforms,
         "dependent_transform_indices": dependent_indices,
+        "has_dependent_transforms": bool(dependent_indices),
         "is_container": is_container,
     }
 
 
+def _write_atomic(path, data):
+    """Write bytes to a file in CACHE_DIR via rename, so readers never see a partial file."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
 # ---------------------------------------------------------------------------
 # Assembly submission helper
 # ---------------------------------------------------------------------------
 
-def submit_assembly_transforms(server, clue_id, transforms, render):
-    """Submit assembly transforms in order. Auto-skip must complete the clue."""
-    for t in transforms:
-        idx = t["index"]
-        val = t["value"]
+# _assembly_action result: transform already completed, nothing to send
+_SKIP = object()
 
-        if render.get("complete") or render.get("currentStep") is None:
-            break
-        current = render["currentStep"]
-        if current["type"] != "assembly":
-            break
 
-        assembly_data = current.get("assemblyData", {})
-        transform_list = assembly_data.get("transforms", [])
-
-        t_entry = None
-        for te in transform_list:
-            if te["index"] == idx:
-                t_entry = te
-                break
-
-        if t_entry is None:
-            # Transform not in display — auto-completed or hidden (straight anagram).
-            # Submit hidden transforms via transform_inputs (the letter boxes).
-            payload = {"clue_id": clue_id, "session": _session(render),
-                       "value": "", "transform_inputs": {str(idx): list(val)}}
-            status, body = api_post(server, "/input", payload)
-            if status == 200:
-                render = body["render"]
-            continue
+def _assembly_action(t, render, by_index):
+    """How transform t is submitted against render: None (clue finished or left
+    the assembly step), _SKIP, "locked", or the /input payload minus clue_id/session.
 
-        if t_entry["status"] == "completed":
-            continue
-        if t_entry["status"] == "locked":
-            raise RuntimeError(f"Transform {idx} is locked — test data ordering error")
+    by_index maps displayed transform index -> entry for this render.
+    """
+    current = render.get("currentStep")
+    if render.get("complete") or current is None or current["type"] != "assembly":
+        return None
+    idx = t["index"]
+    t_entry = by_index.get(idx)
+    if t_entry is None:
+        # Transform not in display — auto-completed or hidden (straight anagram).
+        # Submit hidden transforms via transform_inputs (the letter boxes).
+        return {"value": "", "transform_inputs": {str(idx): list(t["value"])}}
+    if t_entry["status"] == "completed":
+        return _SKIP
+    if t_entry["status"] == "locked":
+        return "locked"
+    return {"value": t["value"], "transform_index": idx}
+
+
+def _displayed_transforms(render):
+    current = render.get("currentStep") or {}
+    return {te["index"]: te for te in (current.get("assemblyData") or {}).get("transforms", [])}
 
-        correct, render = submit_input(server, clue_id, val, render, transform_index=idx)
-        if not correct:
-            raise RuntimeError(f"Transform {idx} value '{val}' rejected as incorrect")
+
+def submit_assembly_transforms(server, clue_id, transforms, render):
+    """Submit assembly transforms in order. Auto-skip must complete the clue.
+
+    The remaining transforms go up as one /batch, each planned against the
+    current render; the server stops the batch once the assembly step is done.
+    Each result is then replayed against the render that op actually ran on;
+    from the first transform whose submission would have differed (e.g.
+    auto-completed by an earlier one), the rest are re-planned and resent — so
+    the outcome is exactly that of submitting one at a time.
+    """
+    pending = list(transforms)
+    while pending:
+        by_index = _displayed_transforms(render)
+        planned = []
+        for t in pending:
+            action = _assembly_action(t, render, by_index)
+            if action is None:
+                return render
+            if action == "locked":
+                if not planned:
+                    raise RuntimeError(f"Transform {t['index']} is locked — test data ordering error")
+                break  # may unlock once earlier transforms land; plan it next round
+            planned.append((t, action))
+
+        ops = [{"path": "/input", "payload": action} for _, action in planned if action is not _SKIP]
+        # The server stops the batch at the first op whose step is already done
+        results = iter(api_post_batch(server, clue_id, render, ops) if ops else ())
+
+        done = 0
+        indexed_render = render
+        for t, action in planned:
+            if render is not indexed_render:
+                by_index, indexed_render = _displayed_transforms(render), render
+            actual = _assembly_action(t, render, by_index)
+            if actual is None:
+                return render
+            if actual == "locked":
+                raise RuntimeError(f"Transform {t['index']} is locked — test data ordering error")
+            if actual != action:
+                break  # planned against a stale render — re-plan from here
+            done += 1
+            if action is _SKIP:
+                continue
+            result = next(results, None)
+            if result is None:
+                raise RuntimeError(f"Batch stopped before transform {t['index']} on an unfinished assembly step")
+            if "transform_index" in action and not result["correct"]:
+                raise RuntimeError(f"Transform {t['index']} value '{t['value']}' rejected as incorrect")
+            render = result["render"]
+        pending = pending[done:]
 
     return render
 
 
 def walk_to_assembly(server, clue):
-    """Walk through all steps up to (but not including) the assembly step."""
+    """Walk through all steps up to (but not including) the assembly step.
+
+    Like start_session, the walk is deterministic for client-carried sessions:
+    the first result per clue is kept on the clue and later calls get a private copy.
+    """
+    cached = clue.get("_assembly_walk")
+    if cached is None:
+        cached = clue["_assembly_walk"] = _walk_to_assembly(server, clue)
+    return copy.deepcopy(cached)
+
+
+def _walk_to_assembly(server, clue):
     render = start_session(server, clue)
     clue_id = render["clue_id"]
 
-    for step in clue["steps"]:
-        if step["inputMode"] == "assembly":
-            break
-        correct, render = submit_input(server, clue_id, step["value"], render)
+    pre_assembly = list(itertools.takewhile(lambda step: step["inputMode"] != "assembly", clue["steps"]))
+
+    flags, render = submit_step_values(server, clue_id, pre_assembly, render)
+    for step, correct in zip(pre_assembly, flags):
         if not correct:
             raise RuntimeError(f"Pre-assembly step {step['type']} failed for {clue['id']}")
 
@@ -292,19 +561,41 @@ def walk_to_assembly(server, clue):
 
 
 def walk_to_completion(server, clue):
-    """Walk through all steps to completion. Returns (clue_id, render)."""
+    """Walk through all steps to completion. Returns (clue_id, render).
+
+    Cached per clue like walk_to_assembly; callers get a private copy.
+    """
+    cached = clue.get("_completion_walk")
+    if cached is None:
+        cached = clue["_completion_walk"] = _walk_to_completion(server, clue)
+    return copy.deepcopy(cached)
+
+
+def _walk_to_completion(server, clue):
     render = start_session(server, clue)
     clue_id = render["clue_id"]
 
+    # Runs of plain steps go up as one batch; assembly steps need the live
+    # render to decide what to submit, so they stay interactive.
+    pending = []
+
+    def flush(render):
+        flags, render = submit_step_values(server, clue_id, pending, render)
+        for step, correct in zip(pending, flags):
+            if not correct:
+                raise RuntimeError(f"Step {step['type']} was rejected for {clue['id']}")
+        pending.clear()
+        return render
+
     for step in clue["steps"]:
         if step["inputMode"] == "assembly":
+            render = flush(render)
             render = submit_assembly_transforms(
                 server, clue_id, step["transforms"], render
             )
         else:
-            correct, render = submit_input(server, clue_id, step["value"], render)
-            if not correct:
-                raise RuntimeError(f"Step {step['type']} was rejected for {clue['id']}")
+            pending.append(step)
+    render = flush(render)
 
     return clue_id, render
 
@@ -313,44 +604,69 @@ def walk_to_completion(server, clue):
 # Test functions
 # ---------------------------------------------------------------------------
 
+# Required response fields, in the order failures are reported. The happy path
+# is a single superset check against the frozenset; only a failure walks the tuple.
+_RENDER_FIELDS = (
+    "clue_id", "words", "answer", "enumeration", "answerGroups",
+    "steps", "currentStep", "stepExpanded", "highlights",
+    "selectedIndices", "userAnswer", "answerLocked", "complete",
+)
+_STEP_SUMMARY_FIELDS = ("index", "type", "title", "status")
+_HIGHLIGHT_FIELDS = ("indices", "color")
+_CURRENT_STEP_FIELDS = ("index", "type", "inputMode", "prompt", "hintVisible")
+_ASSEMBLY_DATA_FIELDS = (
+    "phase", "failMessage", "transforms", "resultParts",
+    "positionMap", "resultGroups", "completedLetters", "definitionLine",
+    "indicatorLine", "checkPhasePrompt",
+)
+_ASSEMBLY_TRANSFORM_FIELDS = ("role", "clueWord", "prompt", "letterCount",
+                              "status", "result", "hint", "hintVisible", "index")
+_FIELD_SETS = {fields: frozenset(fields) for fields in (
+    _RENDER_FIELDS, _STEP_SUMMARY_FIELDS, _HIGHLIGHT_FIELDS, _CURRENT_STEP_FIELDS,
+    _ASSEMBLY_DATA_FIELDS, _ASSEMBLY_TRANSFORM_FIELDS,
+)}
+_STEP_STATUSES = frozenset(("completed", "active", "pending"))
+_TRANSFORM_STATUSES = frozenset(("completed", "active"))
+
+
+def _first_missing(d, fields):
+    """First of fields (declared order) missing from dict d, or None."""
+    if d.keys() >= _FIELD_SETS[fields]:
+        return None
+    return next(field for field in fields if field not in d)
+
+
 def _check_render_shape(render, context=""):
     """Validate the shape of a render response. Returns (ok, error_message)."""
     prefix = f"{context}: " if context else ""
 
     # Top-level required fields
-    top_level = [
-        "clue_id", "words", "answer", "enumeration", "answerGroups",
-        "steps", "currentStep", "stepExpanded", "highlights",
-        "selectedIndices", "userAnswer", "answerLocked", "complete",
-    ]
-    for field in top_level:
-        if field not in render:
-            return False, f"{prefix}Missing top-level field '{field}'"
+    missing = _first_missing(render, _RENDER_FIELDS)
+    if missing:
+        return False, f"{prefix}Missing top-level field '{missing}'"
 
     # Step summary shape
     for i, s in enumerate(render["steps"]):
-        for field in ["index", "type", "title", "status"]:
-            if field not in s:
-                return False, f"{prefix}steps[{i}] missing '{field}'"
-        if s["status"] not in ("completed", "active", "pending"):
+        missing = _first_missing(s, _STEP_SUMMARY_FIELDS)
+        if missing:
+            return False, f"{prefix}steps[{i}] missing '{missing}'"
+        if s["status"] not in _STEP_STATUSES:
             return False, f"{prefix}steps[{i}] invalid status '{s['status']}'"
         if s["status"] == "completed" and "completionText" not in s:
             return False, f"{prefix}steps[{i}] completed but missing 'completionText'"
 
     # Highlight shape
     for i, h in enumerate(render["highlights"]):
-        for field in ["indices", "color"]:
-            if field not in h:
-                return False, f"{prefix}highlights[{i}] missing '{field}'"
+        missing = _first_missing(h, _HIGHLIGHT_FIELDS)
+        if missing:
+            return False, f"{prefix}highlights[{i}] missing '{missing}'"
 
     # currentStep shape (when present)
     step = render["currentStep"]
     if step is not None:
-        for field in ["index", "type", "inputMode", "prompt"]:
-            if field not in step:
-                return False, f"{prefix}currentStep missing '{field}'"
-        if "hintVisible" not in step:
-            return False, f"{prefix}currentStep missing 'hintVisible'"
+        missing = _first_missing(step, _CURRENT_STEP_FIELDS)
+        if missing:
+            return False, f"{prefix}currentStep missing '{missing}'"
 
         # inputMode-specific checks
         if step["inputMode"] == "multiple_choice":
@@ -369,26 +685,19 @@ def _check_render_shape(render, context=""):
 
 def _check_assembly_data_shape(data, prefix=""):
     """Validate the shape of assemblyData. Returns error string or None."""
-    required = [
-        "phase", "failMessage", "transforms", "resultParts",
-        "positionMap", "resultGroups", "completedLetters", "definitionLine",
-        "indicatorLine", "checkPhasePrompt",
-    ]
-    for field in required:
-        if field not in data:
-            return f"{prefix}assemblyData missing '{field}'"
+    missing = _first_missing(data, _ASSEMBLY_DATA_FIELDS)
+    if missing:
+        return f"{prefix}assemblyData missing '{missing}'"
 
     if data["phase"] not in ("transforms", "check"):
         return f"{prefix}assemblyData invalid phase '{data['phase']}'"
 
     # Transform shape
     for i, t in enumerate(data["transforms"]):
-        required_t = ["role", "clueWord", "prompt", "letterCount",
-                       "status", "result", "hint", "hintVisible", "index"]
-        for field in required_t:
-            if field not in t:
-                return f"{prefix}transform[{i}] missing '{field}'"
-        if t["status"] not in ("completed", "active"):
+        missing = _first_missing(t, _ASSEMBLY_TRANSFORM_FIELDS)
+        if missing:
+            return f"{prefix}transform[{i}] missing '{missing}'"
+        if t["status"] not in _TRANSFORM_STATUSES:
             return f"{prefix}transform[{i}] invalid status '{t['status']}'"
         if t["status"] == "completed" and "completedText" not in t:
             return f"{prefix}transform[{i}] completed but missing 'completedText'"
@@ -409,8 +718,8 @@ def test_response_contract(server, clue):
         return False, f"clue_id: got '{render['clue_id']}', expected '{clue['id']}'"
 
     # Compare alpha-only (server may return hyphenated form like LEAVE-TAKING)
-    render_answer = re.sub(r'[^A-Za-z]', '', render["answer"])
-    expected_answer = re.sub(r'[^A-Za-z]', '', clue["answer"])
+    render_answer = _NON_ALPHA_RE.sub('', render["answer"])
+    expected_answer = clue["answer"]  # already alpha-only (build_clue_test_data)
     if render_answer != expected_answer:
         return False, f"answer: got '{render_answer}', expected '{expected_answer}'"
 
@@ -418,7 +727,7 @@ def test_response_contract(server, clue):
         return False, f"enumeration: got '{render['enumeration']}', expected '{clue['enumeration']}'"
 
     # answerGroups sum must equal answer letter count
-    answer_letters = len(re.sub(r'[^A-Z]', '', clue["answer"]))
+    answer_letters = clue["answer_letters"]
     groups_sum = sum(render["answerGroups"])
     if groups_sum != answer_letters:
         return False, f"answerGroups sum {groups_sum} != answer letter count {answer_letters}"
@@ -490,7 +799,7 @@ def test_full_walkthrough(server, clue):
     if not user_answer:
         return False, "userAnswer is empty after completion"
     answer_str = "".join(user_answer)
-    expected = clue["answer"].replace(" ", "")
+    expected = clue["answer"]  # already alpha-only (build_clue_test_data)
     if answer_str != expected:
         return False, f"Answer mismatch: got '{answer_str}', expected '{expected}'"
 
@@ -549,13 +858,20 @@ def test_check_answer(server, clue):
     render = start_session(server, clue)
     clue_id = render["clue_id"]
 
-    correct, render = check_answer(server, clue_id, "ZZZZZ", render)
+    # Both checks in one round trip; the correct one runs on the session the
+    # wrong one left behind, as if typed in sequence
+    wrong_result, right_result = api_post_batch(server, clue_id, render, [
+        {"path": "/check-answer", "payload": {"answer": "ZZZZZ"}},
+        {"path": "/check-answer", "payload": {"answer": clue["answer"]}},
+    ])
+
+    correct, render = wrong_result["correct"], wrong_result["render"]
     if correct:
         return False, "Wrong answer was accepted"
     if render.get("answerLocked"):
         return False, "answerLocked should be False after wrong answer"
 
-    correct, render = check_answer(server, clue_id, clue["answer"], render)
+    correct, render = right_result["correct"], right_result["render"]
     if not correct:
         return False, f"Correct answer '{clue['answer']}' was rejected"
     if not render.get("answerLocked"):
@@ -576,16 +892,18 @@ def test_reveal(server, clue):
     if not render.get("answerLocked"):
         return False, f"Expected answerLocked=True after reveal, got {render.get('answerLocked')}"
 
-    for s in render.get("steps", []):
-        if s["status"] != "completed":
-            return False, f"Step {s['index']} ({s['type']}) status='{s['status']}', expected 'completed'"
+    s = next((s for s in render.get("steps", []) if s["status"] != "completed"), None)
+    if s is not None:
+        return False, f"Step {s['index']} ({s['type']}) status='{s['status']}', expected 'completed'"
 
     return True, ""
 
 
 def test_template_text(server, clue):
     """Indicator menuTitles contain indicator_type text. Definition completedTitle shows hint."""
-    render = start_session(server, clue)
+    # Initial step summaries (for the indicator checks below) and the completed
+    # render both come from this one walkthrough's session.
+    initial_steps = start_session(server, clue).get("steps", [])
     clue_id, full_render = walk_to_completion(server, clue)
 
     # Definition completed title must NOT contain prompt text
@@ -609,22 +927,25 @@ def test_template_text(server, clue):
     answer = clue["answer"].upper()
     answer_raw = clue["answer_raw"].upper()
     if len(answer) >= 5:
-        for s in clue["steps_meta"]:
-            if s["type"] == "definition" and "hint" in s:
+        # Candidate forms: stripped answer, original form for hyphenated/spaced
+        # answers, and the 5+ letter words of multi-word answers
+        candidates = [answer]
+        if answer_raw != answer:
+            candidates.append(answer_raw)
+        if ' ' in answer_raw or '-' in answer_raw:
+            for part in _WORD_SPLIT_RE.split(answer_raw):
+                part_clean = _NON_ALPHA_RE.sub('', part).upper()
+                if len(part_clean) >= 5:
+                    candidates.append(part_clean)
+
+        for s in clue["steps_by_type"].get("definition", []):
+            if "hint" in s:
                 hint_text = s["hint"]
                 hint_upper = hint_text.upper()
-                # Check the stripped answer (no hyphens/spaces) as a whole word
-                found = bool(re.search(r'\b' + re.escape(answer) + r'\b', hint_upper))
-                # Also check the original answer form for hyphenated/spaced answers
-                if not found and answer_raw != answer:
-                    found = bool(re.search(r'\b' + re.escape(answer_raw) + r'\b', hint_upper))
-                # Also check individual words of multi-word answers (5+ letters each)
-                if not found and (' ' in answer_raw or '-' in answer_raw):
-                    for part in re.split(r'[\s-]+', answer_raw):
-                        part_clean = re.sub(r'[^A-Za-z]', '', part).upper()
-                        if len(part_clean) >= 5 and re.search(r'\b' + re.escape(part_clean) + r'\b', hint_upper):
-                            found = True
-                            break
+                # Plain substring test first — most hints don't contain the answer
+                # at all; the word-boundary regex only confirms a hit
+                found = any(c in hint_upper and _word_pattern(c).search(hint_upper)
+                            for c in candidates)
                 if found:
                     return False, (
                         f"Definition hint contains the answer '{answer_raw}': "
@@ -632,31 +953,24 @@ def test_template_text(server, clue):
                     )
 
     # Check completed indicator titles don't redundantly repeat "[type] indicator"
-    INDICATOR_TYPE_LABELS = [
-        "deletion indicator", "reversal indicator", "container indicator",
-        "anagram indicator", "ordering indicator", "letter selection indicator",
-        "hidden word indicator"
-    ]
     for s in full_render.get("steps", []):
         if s["type"] == "indicator" and s["status"] == "completed":
             title = s.get("title", "")
             parts = title.split(" \u2014 ", 1)
             if len(parts) == 2:
-                hint_part = parts[1].lower()
-                for label in INDICATOR_TYPE_LABELS:
-                    if label in hint_part:
-                        return False, (
-                            f"Indicator completed title '{title}' redundantly "
-                            f"mentions '{label}' in the hint — the template "
-                            f"already prefixes with the indicator type"
-                        )
-
-    # Check indicator steps in the initial render
-    render = start_session(server, clue)
-    steps = render.get("steps", [])
+                label = _INDICATOR_LABEL_RE.search(parts[1].lower())
+                if label:
+                    return False, (
+                        f"Indicator completed title '{title}' redundantly "
+                        f"mentions '{label.group(0)}' in the hint — the template "
+                        f"already prefixes with the indicator type"
+                    )
+
+    # Check indicator steps in the initial render. No indicator_types means no
+    # indicator steps are expected, so an unexpected one fails the first check.
     indicator_step_idx = 0
 
-    for s in steps:
+    for s in initial_steps:
         if s["type"] == "indicator":
             if indicator_step_idx >= len(clue["indicator_types"]):
                 return False, f"More indicator steps than expected indicator_types"
@@ -679,29 +993,17 @@ def test_template_text(server, clue):
             f"found {indicator_step_idx}"
         )
 
-    if not clue["has_indicator_steps"]:
-        for s in steps:
-            if s["type"] == "indicator":
-                return False, "Found unexpected indicator step"
-
     return True, ""
 
 
 def test_assembly_completion_text(server, clue):
     """Verify assembly completion title for container clues shows insertion notation."""
-    if not clue["is_container"]:
-        return True, ""
-
     clue_id, render = walk_to_completion(server, clue)
 
     if not render.get("complete"):
         return False, "Clue did not complete"
 
-    assembly_step = None
-    for s in render.get("steps", []):
-        if s["type"] == "assembly":
-            assembly_step = s
-            break
+    assembly_step = next((s for s in render.get("steps", []) if s["type"] == "assembly"), None)
 
     if not assembly_step:
         return False, "No assembly step found in completed steps"
@@ -709,11 +1011,7 @@ def test_assembly_completion_text(server, clue):
     title = assembly_step.get("title", "")
 
     # Container clue: title must NOT be plain "A + B + C + D" concatenation
-    assembly_meta = None
-    for step in clue["steps"]:
-        if step["inputMode"] == "assembly":
-            assembly_meta = step
-            break
+    assembly_meta = clue["assembly_step"]
     if assembly_meta:
         transform_results = [t["value"] for t in assembly_meta["transforms"]]
         plain_concat = " + ".join(transform_results)
@@ -728,19 +1026,16 @@ def test_assembly_completion_text(server, clue):
 
 def test_indicator_coverage(server, clue):
     """Verify that dependent transforms have matching indicator steps."""
-    steps = clue["steps_meta"]
+    steps_by_type = clue["steps_by_type"]
 
     indicator_types_covered = set()
-    for s in steps:
-        if s["type"] == "indicator":
-            ind_type = s.get("indicator_type", "")
-            indicator_types_covered.add(ind_type)
-            if ind_type == "hidden_word":
-                indicator_types_covered.add("reversal")
+    for s in steps_by_type.get("indicator", []):
+        ind_type = s.get("indicator_type", "")
+        indicator_types_covered.add(ind_type)
+        if ind_type == "hidden_word":
+            indicator_types_covered.add("reversal")
 
-    for s in steps:
-        if s["type"] != "assembly":
-            continue
+    for s in steps_by_type.get("assembly", []):
         for t in s.get("transforms", []):
             t_type = t.get("type", "")
             if t_type not in DEPENDENT_TRANSFORM_TYPES:
@@ -760,40 +1055,53 @@ def test_indicator_coverage(server, clue):
 
 def test_abbreviation_scan_consistency(server, clue):
     """Verify abbreviation_scan mappings keys match indices and assembly transforms."""
-    steps = clue["steps_meta"]
     words = clue.get("words", [])
+    assembly_steps = clue["steps_by_type"].get("assembly", [])
+
+    # All indices covered by assembly abbreviation transforms — the same for every scan step
+    covered_by_transforms = {
+        ti
+        for asm in assembly_steps
+        for t in asm.get("transforms", [])
+        if t.get("type") == "abbreviation"
+        for ti in t.get("indices", [])
+    }
 
-    for s in steps:
-        if s["type"] != "abbreviation_scan":
-            continue
-
+    # Per assembly step: word index -> abbreviation results covering it. Stops at the
+    # first substitution step — substitution clues express abbreviations through the
+    # substitution operation, not through separate abbreviation transforms.
+    abbrev_results_by_step = []
+    for asm in assembly_steps:
+        asm_transforms = asm.get("transforms", [])
+        if any(t.get("type") == "substitution" for t in asm_transforms):
+            break
+        by_index = {}
+        for t in asm_transforms:
+            if t.get("type") == "abbreviation":
+                for ti in t.get("indices", []):
+                    by_index.setdefault(ti, set()).add(t["result"].upper())
+        abbrev_results_by_step.append(by_index)
+
+    scan_steps = clue["steps_by_type"].get("abbreviation_scan", [])
+    for s, mapping_pairs in zip(scan_steps, clue["abbreviation_mappings"]):
         indices = s.get("indices", [])
+        indices_set = frozenset(indices)
         mappings = s.get("mappings", {})
+        mapped_indices = {key_int for key_int, _ in mapping_pairs}
 
         # Every mappings key must be in indices
-        for key_str in mappings:
-            key_int = int(key_str)
-            if key_int not in indices:
+        for key_int, _ in mapping_pairs:
+            if key_int not in indices_set:
                 word_at_key = words[key_int] if key_int < len(words) else "?"
                 return False, (
-                    f"abbreviation_scan mappings key '{key_str}' (word: '{word_at_key}') "
+                    f"abbreviation_scan mappings key '{key_int}' (word: '{word_at_key}') "
                     f"is not in indices {indices}"
                 )
 
         # Every index must either have a mappings entry or be part of a
         # multi-word abbreviation (where only the first index has the mapping)
-        # Build set of all indices covered by assembly abbreviation transforms
-        covered_by_transforms = set()
-        for asm in steps:
-            if asm["type"] != "assembly":
-                continue
-            for t in asm.get("transforms", []):
-                if t.get("type") == "abbreviation":
-                    for ti in t.get("indices", []):
-                        covered_by_transforms.add(ti)
-
         for idx in indices:
-            if str(idx) not in mappings and idx not in covered_by_transforms:
+            if idx not in mapped_indices and idx not in covered_by_transforms:
                 word_at_idx = words[idx] if idx < len(words) else "?"
                 return False, (
                     f"abbreviation_scan index {idx} (word: '{word_at_idx}') "
@@ -802,23 +1110,9 @@ def test_abbreviation_scan_consistency(server, clue):
                 )
 
         # Each mapped abbreviation must match an assembly abbreviation transform
-        # Exception: substitution clues express abbreviations through the substitution
-        # operation, not through separate abbreviation transforms
-        for asm in steps:
-            if asm["type"] != "assembly":
-                continue
-            has_substitution = any(t.get("type") == "substitution" for t in asm.get("transforms", []))
-            if has_substitution:
-                break  # substitution clues don't need abbreviation transforms
-            for key_str, letter in mappings.items():
-                key_int = int(key_str)
-                matched = False
-                for t in asm.get("transforms", []):
-                    if t.get("type") == "abbreviation" and key_int in t.get("indices", []):
-                        if t["result"].upper() == letter.upper():
-                            matched = True
-                            break
-                if not matched:
+        for abbrev_by_index in abbrev_results_by_step:
+            for key_int, letter in mapping_pairs:
+                if letter.upper() not in abbrev_by_index.get(key_int, ()):
                     word_at_key = words[key_int] if key_int < len(words) else "?"
                     return False, (
                         f"abbreviation_scan maps '{word_at_key}' (index {key_int}) → {letter}, "
@@ -837,14 +1131,7 @@ def test_assembly_combined_check(server, clue):
     If auto-skip fails (position_map is wrong), the engine falls through to
     check phase, which this test must detect as a failure.
     """
-    assembly_step = None
-    for step in clue["steps"]:
-        if step["inputMode"] == "assembly":
-            assembly_step = step
-            break
-    if not assembly_step:
-        return True, ""
-
+    assembly_step = clue["assembly_step"]
     clue_id, render = walk_to_assembly(server, clue)
 
     render = submit_assembly_transforms(
@@ -853,14 +1140,15 @@ def test_assembly_combined_check(server, clue):
 
     if not render.get("complete"):
         # Auto-skip didn't fire — check if we're stuck in check phase
-        current = render.get("currentStep", {})
-        assembly_data = current.get("assemblyData", {})
-        if assembly_data.get("phase") == "check":
+        current = render.get("currentStep") or {}
+        assembly_data = current.get("assemblyData") or {}
+        phase = assembly_data.get("phase")
+        transforms = assembly_data.get("transforms") or []
+        if phase == "check":
             return False, (
                 "All transforms completed but auto-skip failed — stuck in check phase. "
                 "This usually means _compute_position_map returned empty for this clue."
             )
-        transforms = assembly_data.get("transforms", [])
         incomplete = [t for t in transforms if t["status"] != "completed"]
         incomplete_desc = ", ".join(f"{t['index']}({t['role']})" for t in incomplete)
         return False, (
@@ -873,14 +1161,7 @@ def test_assembly_combined_check(server, clue):
 
 def test_dependent_prompt_update(server, clue):
     """Dependent transform prompts update when predecessors are solved."""
-    if not clue["dependent_transform_indices"]:
-        return True, ""
-
-    assembly_step = None
-    for step in clue["steps"]:
-        if step["inputMode"] == "assembly":
-            assembly_step = step
-            break
+    assembly_step = clue["assembly_step"]
     if not assembly_step:
         return True, ""
 
@@ -890,11 +1171,7 @@ def test_dependent_prompt_update(server, clue):
     transforms = assembly_data["transforms"]
 
     dep_idx = clue["dependent_transform_indices"][0]
-    dep_transform = None
-    for t in transforms:
-        if t["index"] == dep_idx:
-            dep_transform = t
-            break
+    dep_transform = {t["index"]: t for t in transforms}.get(dep_idx)
     if dep_transform is None:
         # Straight anagrams have no visible transforms — skip this test.
         if len(transforms) == 0:
@@ -903,17 +1180,21 @@ def test_dependent_prompt_update(server, clue):
 
     initial_prompt = dep_transform["prompt"]
 
-    # Solve the predecessor(s)
-    for t in assembly_step["transforms"]:
-        if t["index"] < dep_idx:
-            correct, render = submit_input(server, clue_id, t["value"], render,
-                                           transform_index=t["index"])
-            if not correct:
-                return False, f"Predecessor transform {t['index']} rejected"
-            # Auto-skip may have completed the assembly step
-            current = render.get("currentStep")
-            if current is None or current.get("inputMode") != "assembly":
-                return True, ""
+    # Solve the predecessor(s) — one batch request
+    predecessors = [t for t in assembly_step["transforms"] if t["index"] < dep_idx]
+    ops = [{"path": "/input", "payload": {"value": t["value"], "transform_index": t["index"]}}
+           for t in predecessors]
+    # Auto-skip may complete the clue part-way; the server then stops the batch
+    results = api_post_batch(server, clue_id, render, ops) if ops else []
+
+    for t, result in zip(predecessors, results):
+        render = result["render"]
+        if not result["correct"]:
+            return False, f"Predecessor transform {t['index']} rejected"
+        # Auto-skip may have completed the assembly step
+        current = render.get("currentStep")
+        if current is None or current.get("inputMode") != "assembly":
+            return True, ""
 
     # Re-check the dependent transform's prompt
     # If auto-skip completed the assembly step, the prompt update is moot — pass
@@ -922,17 +1203,12 @@ def test_dependent_prompt_update(server, clue):
         return True, ""
     assembly_data = current["assemblyData"]
     transforms = assembly_data["transforms"]
-    for t in transforms:
-        if t["index"] == dep_idx:
-            dep_transform = t
-            break
+    # Not displayed any more -> keep the initial entry (prompt counts as unchanged)
+    dep_transform = {t["index"]: t for t in transforms}.get(dep_idx, dep_transform)
 
     updated_prompt = dep_transform["prompt"]
 
-    TEMPLATE_MARKERS = ["tells you to reverse", "tells you to shorten",
-                        "rearrange those letters",
-                        "tells you one piece goes inside another"]
-    uses_template = any(m in initial_prompt for m in TEMPLATE_MARKERS)
+    uses_template = bool(_TEMPLATE_MARKER_RE.search(initial_prompt))
 
     if updated_prompt == initial_prompt:
         if not uses_template:
@@ -976,13 +1252,11 @@ def test_help_toggle(server, clue):
 def test_partial_tap_feedback(server, clue):
     """Submitting a correct subset of tap_words indices should give partial feedback, not generic 'try again'."""
     # Find a step with tap_words inputMode that expects 2+ indices
-    multi_index_step = None
-    multi_index_step_idx = None
-    for i, sv in enumerate(clue["steps"]):
-        if sv["inputMode"] == "tap_words" and isinstance(sv.get("value"), list) and len(sv["value"]) >= 2:
-            multi_index_step = sv
-            multi_index_step_idx = i
-            break
+    multi_index_step_idx, multi_index_step = next(
+        ((i, sv) for i, sv in enumerate(clue["steps"])
+         if sv["inputMode"] == "tap_words" and isinstance(sv.get("value"), list) and len(sv["value"]) >= 2),
+        (None, None),
+    )
 
     if not multi_index_step:
         return True, ""  # No multi-index tap_words step — skip
@@ -991,7 +1265,7 @@ def test_partial_tap_feedback(server, clue):
     clue_id = render["clue_id"]
 
     # Navigate to the target step if it's not already expanded
-    current = render.get("currentStep", {})
+    current = render.get("currentStep") or {}
     if current.get("index") != multi_index_step_idx:
         render = send_ui_state(server, clue_id, render, "select_step", {"step_index": multi_index_step_idx})
 
@@ -1014,15 +1288,8 @@ def test_partial_tap_feedback(server, clue):
 
 def test_container_breakdown_sources(server, clue):
     """Container clue completed summary must show source word → result for all outer/inner transforms."""
-    if not clue["is_container"]:
-        return True, ""  # Not a container clue — skip
-
     # Find the assembly step metadata to check for non-abbreviation outer/inner transforms
-    assembly_meta = None
-    for step in clue["steps_meta"]:
-        if step["type"] == "assembly":
-            assembly_meta = step
-            break
+    assembly_meta = next(iter(clue["steps_by_type"].get("assembly", [])), None)
     if not assembly_meta:
         return True, ""  # No assembly step
 
@@ -1050,11 +1317,7 @@ def test_container_breakdown_sources(server, clue):
     if not render.get("complete"):
         return False, "Clue did not complete"
 
-    assembly_step = None
-    for s in render.get("steps", []):
-        if s["type"] == "assembly":
-            assembly_step = s
-            break
+    assembly_step = next((s for s in render.get("steps", []) if s["type"] == "assembly"), None)
     if not assembly_step:
         return False, "No assembly step found in completed steps"
 
@@ -1080,29 +1343,94 @@ def test_container_breakdown_sources(server, clue):
 # Test runner
 # ---------------------------------------------------------------------------
 
+def _has_assembly_step(clue):
+    return clue["assembly_step"] is not None
+
+
+def _is_container(clue):
+    return clue["is_container"]
+
+
+def _has_dependent_transforms(clue):
+    return clue["has_dependent_transforms"]
+
+
+# (name, test function, predicate). A test only runs for clues its predicate
+# accepts (None = every clue); the rest are reported as skipped.
 ALL_TESTS = [
-    ("Response contract", test_response_contract),
-    ("Full walkthrough", test_full_walkthrough),
-    ("Wrong input", test_wrong_input),
-    ("Assembly transform status", test_assembly_transform_status),
-    ("Check answer", test_check_answer),
-    ("Reveal", test_reveal),
-    ("Template text", test_template_text),
-    ("Assembly completion text", test_assembly_completion_text),
-    ("Indicator coverage", test_indicator_coverage),
-    ("Abbreviation scan consistency", test_abbreviation_scan_consistency),
-    ("Assembly combined check", test_assembly_combined_check),
-    ("Dependent prompt update", test_dependent_prompt_update),
-    ("Help toggle", test_help_toggle),
-    ("Partial tap feedback", test_partial_tap_feedback),
-    ("Container breakdown sources", test_container_breakdown_sources),
+    ("Response contract", test_response_contract, None),
+    ("Full walkthrough", test_full_walkthrough, None),
+    ("Wrong input", test_wrong_input, None),
+    ("Assembly transform status", test_assembly_transform_status, _has_assembly_step),
+    ("Check answer", test_check_answer, None),
+    ("Reveal", test_reveal, None),
+    ("Template text", test_template_text, None),
+    ("Assembly completion text", test_assembly_completion_text, _is_container),
+    ("Indicator coverage", test_indicator_coverage, None),
+    ("Abbreviation scan consistency", test_abbreviation_scan_consistency, None),
+    ("Assembly combined check", test_assembly_combined_check, _has_assembly_step),
+    ("Dependent prompt update", test_dependent_prompt_update, _has_dependent_transforms),
+    ("Help toggle", test_help_toggle, None),
+    ("Partial tap feedback", test_partial_tap_feedback, None),
+    ("Container breakdown sources", test_container_breakdown_sources, _is_container),
 ]
 
 
-def run_tests(server, clue_filter=None):
-    """Fetch all clues from server, build test data, run all tests."""
+def _clue_label(clue):
+    d_char = 'A' if clue['direction'] == 'across' else 'D'
+    return f"{clue['clue_number']}{d_char} {clue['answer']}"
+
+
+def run_clue_tests(server, clue, fail_fast=False):
+    """Run ALL_TESTS for one clue. Returns [(full_name, status, msg)], status PASS/FAIL/ERROR/SKIP.
+
+    With fail_fast, the first FAIL/ERROR skips the clue's remaining tests.
+    """
+    label = _clue_label(clue)
+    results = []
+    failed = False
+    for test_name, test_fn, predicate in ALL_TESTS:
+        full_name = f"{label} - {test_name}"
+        if failed:
+            results.append((full_name, "SKIP", "earlier test failed"))
+            continue
+        if predicate is not None and not predicate(clue):
+            results.append((full_name, "SKIP", ""))
+            continue
+        try:
+            ok, msg = test_fn(server, clue)
+            results.append((full_name, "PASS" if ok else "FAIL", msg))
+        except Exception as e:
+            ok = False
+            results.append((full_name, "ERROR", str(e)))
+        failed = fail_fast and not ok
+    return results
+
+
+def _build_and_run_clue(server, clue_id, metadata, fail_fast):
+    """Build one clue's test data and run its tests.
+
+    Returns (clue, results), or (None, error message) if the test data
+    cannot be built.
+    """
+    try:
+        clue = build_clue_test_data(clue_id, metadata)
+    except Exception as e:
+        return None, str(e)
+    return clue, run_clue_tests(server, clue, fail_fast)
+
+
+def run_tests(server, clue_filter=None, workers=None, use_cache=True, fail_fast=False):
+    """Fetch all clues from server, build test data, run all tests.
+
+    Clues run concurrently on `workers` threads (default: up to MAX_WORKERS);
+    output is printed in clue order once each clue finishes. The clue catalog
+    is reused from CACHE_DIR while its ETag is unchanged, unless use_cache is
+    False. fail_fast stops each clue at its first failure (see run_clue_tests).
+    """
     passed = 0
     failed = 0
+    skipped = 0
     errors = []
 
     print(f"=== Trainer Regression Tests ===")
@@ -1111,8 +1439,7 @@ def run_tests(server, clue_filter=None):
 
     # Fetch all clues with training data (one bulk call)
     print("Loading clues from Supabase via /trainer/clue-ids?full=1 ...")
-    all_data = api_get(server, "/clue-ids?full=1")
-    clues_dict = all_data["clues"]
+    clues_dict = fetch_clue_catalog(server, use_cache)
     if clue_filter:
         matches = {k: v for k, v in clues_dict.items() if clue_filter in k}
         if not matches:
@@ -1122,46 +1449,49 @@ def run_tests(server, clue_filter=None):
     print(f"Testing {len(clues_dict)} clue(s)")
     print()
 
-    # Build test data for each clue
-    all_clues = []
-    for clue_id in sorted(clues_dict.keys()):
-        metadata = clues_dict[clue_id]
-        try:
-            clue = build_clue_test_data(clue_id, metadata)
-            all_clues.append(clue)
-        except Exception as e:
-            print(f"  [ERROR] Cannot build test data for {clue_id}: {e}")
-            failed += 1
-            errors.append((f"{clue_id} - Build test data", str(e)))
-
-    # Run all tests for each clue
-    for clue in all_clues:
-        d_char = 'A' if clue['direction'] == 'across' else 'D'
-        label = f"{clue['clue_number']}{d_char} {clue['answer']}"
-        print(f"--- {label} ---")
-
-        for test_name, test_fn in ALL_TESTS:
-            full_name = f"{label} - {test_name}"
-            try:
-                ok, msg = test_fn(server, clue)
-                if ok:
-                    print(f"  [PASS] {full_name}")
+    # Build test data and run all tests for each clue — clues in parallel on
+    # one pool, so later clues are still building while earlier ones run;
+    # results are printed in clue order
+    clue_ids = sorted(clues_dict.keys())
+    clues_tested = 0
+    if workers is None:
+        workers = min(MAX_WORKERS, len(clue_ids))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(_build_and_run_clue, server, clue_id, clues_dict[clue_id], fail_fast)
+            for clue_id in clue_ids
+        ]
+        for clue_id, future in zip(clue_ids, futures):
+            clue, results = future.result()
+            if clue is None:
+                print(f"  [ERROR] Cannot build test data for {clue_id}: {results}")
+                failed += 1
+                errors.append((f"{clue_id} - Build test data", results))
+                continue
+            clues_tested += 1
+            # One write per clue rather than one print per test line
+            buf = io.StringIO()
+            buf.write(f"--- {_clue_label(clue)} ---\n")
+            for full_name, status, msg in results:
+                if status == "PASS":
+                    buf.write(f"  [PASS] {full_name}\n")
                     passed += 1
+                elif status == "SKIP":
+                    buf.write(f"  [SKIP] {full_name}: {msg}\n" if msg else f"  [SKIP] {full_name}\n")
+                    skipped += 1
                 else:
-                    print(f"  [FAIL] {full_name}: {msg}")
+                    buf.write(f"  [{status}] {full_name}: {msg}\n")
                     failed += 1
                     errors.append((full_name, msg))
-            except Exception as e:
-                print(f"  [ERROR] {full_name}: {e}")
-                failed += 1
-                errors.append((full_name, str(e)))
-
-        print()
+            buf.write("\n")
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
 
     print(f"=== Summary ===")
-    print(f"Clues tested: {len(all_clues)}")
+    print(f"Clues tested: {clues_tested}")
     print(f"Passed: {passed}/{passed + failed}")
     print(f"Failed: {failed}")
+    print(f"Skipped: {skipped}")
 
     if errors:
         print()
@@ -1177,30 +1507,25 @@ def run_tests(server, clue_filter=None):
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    server = DEFAULT_SERVER
-    clue_filter = None
-
-    for i, arg in enumerate(sys.argv[1:], 1):
-        if arg == "--server" and i < len(sys.argv) - 1:
-            server = sys.argv[i + 1]
-        elif arg == "--clue" and i < len(sys.argv) - 1:
-            clue_filter = sys.argv[i + 1]
-        elif sys.argv[i - 1] in ("--server", "--clue"):
-            pass
-        elif arg.startswith("--server="):
-            server = arg.split("=", 1)[1]
-        elif arg.startswith("--clue="):
-            clue_filter = arg.split("=", 1)[1]
-
-    # Quick connectivity check
+    parser = argparse.ArgumentParser(description="Trainer regression tests against a running server")
+    parser.add_argument("--server", default=DEFAULT_SERVER, help="Server URL (http://, https:// or unix:///path)")
+    parser.add_argument("--clue", help="Only test clue IDs containing this substring")
+    parser.add_argument("--workers", type=int, help=f"Clues tested concurrently (default: up to {MAX_WORKERS})")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false",
+                        help="Refetch the clue catalog")
+    parser.add_argument("--fail-fast-per-clue", dest="fail_fast", action="store_true",
+                        help="Stop each clue's tests at its first failure")
+    args = parser.parse_args()
+    server = args.server
+
+    # Quick connectivity check — just opens the pooled connection, no request;
+    # the catalog fetch that starts the run goes out on the same socket
     try:
-        req = urllib.request.Request(f"{server}/")
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            pass
+        _get_conn(server)[1].connect()
     except Exception as e:
         print(f"Cannot connect to server at {server}: {e}")
         print("Make sure crossword_server.py is running.")
         sys.exit(1)
 
-    success = run_tests(server, clue_filter)
+    success = run_tests(server, args.clue, args.workers, args.use_cache, args.fail_fast)
     sys.exit(0 if success else 1)
@@ -14,6 +14,7 @@ Routes:
     /trainer/ui-state       - Update UI state (hint toggle, word select, answer typing)
     /trainer/reveal         - Reveal full answer
     /trainer/check-answer   - Validate typed answer
+    /trainer/batch          - Apply a sequence of the above ops to one session
 """
 
 from flask import Blueprint, request, jsonify
@@ -49,11 +50,14 @@ def _get_session_and_clue(data):
 @trainer_bp.route('/clue-ids', methods=['GET'])
 def trainer_clue_ids():
     """Return all clue IDs with training data in Supabase.
-    With ?full=1, returns full metadata for each clue (for test runner).
+    With ?full=1, returns full metadata for each clue (for test runner), with an
+    ETag so the runner can revalidate its cached copy (304 when unchanged).
     """
     if request.args.get('full'):
         all_data = training_handler.list_all_clue_data()
-        return jsonify({'clues': all_data})
+        response = jsonify({'clues': all_data})
+        response.add_etag()
+        return response.make_conditional(request)
     clue_ids = training_handler.list_clue_ids()
     return jsonify({'clue_ids': clue_ids})
 
@@ -156,3 +160,36 @@ def trainer_check_answer():
     answer = data.get('answer', '')
     result = training_handler.check_answer(clue_id, clue_data, session, answer)
     return jsonify(result)
+
+
+@trainer_bp.route('/batch', methods=['POST'])
+def trainer_batch():
+    """Apply several ops (/input, /ui-state, /reveal, /check-answer) to one session in a single request.
+
+    Body: {clue_id, session, ops: [{path, payload}]}. Returns {results: [...]},
+    one entry per op, each the body the single-op route would have returned.
+    """
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    clue_id, clue_data, session = _get_session_and_clue(data)
+    if not clue_id or not clue_data or not session:
+        return jsonify({'error': 'Invalid clue_id or session'}), 400
+
+    ops = data.get('ops')
+    if not isinstance(ops, list):
+        return jsonify({'error': 'ops must be a list'}), 400
+    max_ops = training_handler.max_batch_ops(clue_data)
+    if len(ops) > max_ops:
+        return jsonify({'error': f'ops has {len(ops)} entries; at most {max_ops} allowed for this clue'}), 400
+    for i, op in enumerate(ops):
+        if not isinstance(op, dict):
+            return jsonify({'error': f'ops[{i}] must be an object'}), 400
+        if not isinstance(op.get('path'), str) or op['path'] not in training_handler.BATCH_OP_PATHS:
+            return jsonify({'error': f"ops[{i}]: unsupported path '{op.get('path')}'"}), 400
+        if not isinstance(op.get('payload'), dict):
+            return jsonify({'error': f'ops[{i}]: payload must be an object'}), 400
+
+    results = training_handler.handle_batch(clue_id, clue_data, session, ops)
+    return jsonify({'results': results})
@@ -6,12 +6,17 @@ Reads flat steps from clue metadata, looks up render templates by step type,
 presents each step, validates input, advances. That's it.
 """
 
+import copy
+import functools
 import hashlib
 import hmac
 import json
 import os
 import re
 import secrets
+import sys
+import threading
+import types
 
 from training_constants import DEPENDENT_TRANSFORM_TYPES, find_consumed_predecessors, find_terminal_transforms
 from validate_training import validate_training_item
@@ -22,18 +27,38 @@ if not _SESSION_SECRET:
     _SESSION_SECRET = secrets.token_bytes(32)
     print("[WARNING] No SESSION_SECRET env var — using random key (sessions won't survive restarts)")
 
+# Patterns used on every request — compiled once
+_NON_UPPER_RE = re.compile(r'[^A-Z]')
+_NON_ALPHA_RE = re.compile(r'[^A-Za-z]')
+_ENUM_SPLIT_RE = re.compile(r'[,\s]+')
+_CLUE_ID_RE = re.compile(r'^[a-z]+-(\d+)-(\d+)([ad])$')
+
 # --- Render templates (auto-reload) ---
 
-RENDER_TEMPLATES = {}
+# Read-only view, replaced wholesale on reload. Callers that need to mutate must copy.
+RENDER_TEMPLATES = types.MappingProxyType({})
 RENDER_TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), "render_templates.json")
 RENDER_TEMPLATES_MTIME = 0
 
 
+def _share_strings(obj, pool):
+    """Return obj with each distinct string value replaced by one shared instance from pool."""
+    if isinstance(obj, str):
+        return pool.setdefault(obj, obj)
+    if isinstance(obj, dict):
+        return {pool.setdefault(k, k): _share_strings(v, pool) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_share_strings(v, pool) for v in obj]
+    return obj
+
+
 def _load_render_templates():
     global RENDER_TEMPLATES, RENDER_TEMPLATES_MTIME
     current_mtime = os.path.getmtime(RENDER_TEMPLATES_PATH)
     with open(RENDER_TEMPLATES_PATH, "r") as f:
-        RENDER_TEMPLATES = json.load(f)
+        templates = _share_strings(json.load(f), {})
+    # Intern step-type keys so lookups by interned step["type"] compare by identity
+    RENDER_TEMPLATES = types.MappingProxyType({sys.intern(k): v for k, v in templates.items()})
     RENDER_TEMPLATES_MTIME = current_mtime
     print(f"Loaded render_templates.json ({len(RENDER_TEMPLATES)} templates, mtime: {current_mtime})")
 
@@ -55,6 +80,9 @@ _load_render_templates()
 # Cleared on server restart (which happens on any .py file change via Werkzeug reloader).
 _clue_cache = {}
 _cached_puzzles = set()  # Track which puzzles have been bulk-fetched
+# One lock per puzzle, so concurrent first requests share a single bulk fetch
+_puzzle_locks = {}
+_puzzle_locks_guard = threading.Lock()
 
 
 def _get_store():
@@ -76,6 +104,13 @@ def list_all_clue_data():
     return store.get_training_clues()
 
 
+def _intern_step_types(item):
+    """Intern each step's type so it matches the interned RENDER_TEMPLATES keys."""
+    for step in item.get("steps", []):
+        if "type" in step:
+            step["type"] = sys.intern(step["type"])
+
+
 def lookup_clue(puzzle_number, clue_number, direction):
     """
     Fetch a clue from Supabase by key, validate it, and return it.
@@ -83,7 +118,8 @@ def lookup_clue(puzzle_number, clue_number, direction):
     On validation failure, raises ValueError with error details.
 
     Uses a puzzle-level cache: first request for any clue in a puzzle
-    bulk-fetches all clues for that puzzle in one Supabase query.
+    bulk-fetches all clues for that puzzle in one Supabase query. Concurrent
+    first requests for the same puzzle wait on that one fetch.
     """
     if not (puzzle_number and clue_number and direction):
         return None, None
@@ -96,11 +132,18 @@ def lookup_clue(puzzle_number, clue_number, direction):
 
     # Bulk-fetch the whole puzzle on first access
     if str(puzzle_number) not in _cached_puzzles:
-        store = _get_store()
-        puzzle_clues = store.get_training_clues_for_puzzle(str(puzzle_number))
-        _clue_cache.update(puzzle_clues)
-        _cached_puzzles.add(str(puzzle_number))
-        print(f"[Cache] Bulk-loaded {len(puzzle_clues)} clues for puzzle {puzzle_number}")
+        with _puzzle_locks_guard:
+            puzzle_lock = _puzzle_locks.setdefault(str(puzzle_number), threading.Lock())
+        with puzzle_lock:
+            # Another request may have loaded it while we waited
+            if str(puzzle_number) not in _cached_puzzles:
+                store = _get_store()
+                puzzle_clues = store.get_training_clues_for_puzzle(str(puzzle_number))
+                for _, item in puzzle_clues.values():
+                    _intern_step_types(item)
+                _clue_cache.update(puzzle_clues)
+                _cached_puzzles.add(str(puzzle_number))
+                print(f"[Cache] Bulk-loaded {len(puzzle_clues)} clues for puzzle {puzzle_number}")
 
     # Lookup from cache
     cached = _clue_cache.get(cache_key)
@@ -122,8 +165,7 @@ def lookup_clue(puzzle_number, clue_number, direction):
 def lookup_clue_by_id(clue_id):
     """Look up clue data from a clue_id like 'times-29147-1a'.
     Returns clue_data or None. Used by routes that receive clue_id from the client."""
-    import re as _re
-    m = _re.match(r'^[a-z]+-(\d+)-(\d+)([ad])$', clue_id)
+    m = _CLUE_ID_RE.match(clue_id)
     if not m:
         return None
     puzzle_number = m.group(1)
@@ -144,7 +186,7 @@ _SESSION_FIELDS = {
     "selected_indices": [],
     "hint_visible": False,
     "step_expanded": False,
-    "user_answer": [],
+    "user_answer": "",  # Packed answer boxes — one char per box, " " = empty
     "answer_locked": False,
     "highlights": [],
     "assembly_transforms_done": {},
@@ -160,6 +202,16 @@ def _new_session():
     return {k: (v.copy() if isinstance(v, (list, dict)) else v) for k, v in _SESSION_FIELDS.items()}
 
 
+def _pack_answer(letters):
+    """Pack per-box answer letters into the session's one-char-per-box string."""
+    return "".join(str(letter)[:1] if letter else " " for letter in letters)
+
+
+def _unpack_answer(packed):
+    """Expand the packed answer string back into the per-box list the client renders."""
+    return ["" if c == " " else c for c in packed]
+
+
 def _sign_session(session_data):
     """Sign a session dict with HMAC. Returns {"data": ..., "sig": "..."}."""
     payload = json.dumps(session_data, sort_keys=True, separators=(',', ':'))
@@ -188,6 +240,9 @@ def restore_session(raw):
     for key in _SESSION_FIELDS:
         if key in verified_data:
             session[key] = verified_data[key]
+    # Answer boxes arrive packed; a per-box list is normalised to the packed form
+    if isinstance(session["user_answer"], list):
+        session["user_answer"] = _pack_answer(session["user_answer"])
     # JSON round-trip turns int dict keys to strings — convert back
     atd = session["assembly_transforms_done"]
     if atd:
@@ -231,7 +286,7 @@ def get_render(clue_id, clue, session):
         session["completed_steps"].append(step_index)
         session["step_index"] = step_index + 1
         session["answer_locked"] = True
-        answer_letters = list(re.sub(r'[^A-Z]', '', clue["answer"].upper()))
+        answer_letters = _NON_UPPER_RE.sub('', clue["answer"].upper())
         session["user_answer"] = answer_letters
         return _build_all_done(session, clue, clue_id)
 
@@ -316,15 +371,7 @@ def get_render(clue_id, clue, session):
     if step_index in session["completed_steps"]:
         current_step["completionText"] = _resolve_on_correct(template, step, clue)
 
-    # Compute answer box groups from enumeration: commas separate words,
-    # hyphens join within a word. "5-6" → [11], "5,3" → [5, 3], "7" → [7]
-    enum_str = clue.get("enumeration", "")
-    answer_groups = []
-    for part in re.split(r'[,\s]+', enum_str):
-        if part:
-            total = sum(int(n) for n in part.split('-') if n.isdigit())
-            if total > 0:
-                answer_groups.append(total)
+    answer_groups = _compute_answer_groups(clue.get("enumeration", ""))
 
     # Phase help — scan or assembly text based on current step type
     phase_help = RENDER_TEMPLATES.get("phaseHelp")
@@ -349,7 +396,7 @@ def get_render(clue_id, clue, session):
         "highlights": session["highlights"],
         "selectedIndices": session["selected_indices"],
         "showSubmitButton": current_step["inputMode"] == "tap_words" and len(session["selected_indices"]) > 0,
-        "userAnswer": session["user_answer"],
+        "userAnswer": _unpack_answer(session["user_answer"]),
         "answerLocked": session["answer_locked"],
         "complete": False,
         "session": _sign_session(session),
@@ -381,8 +428,8 @@ def handle_input(clue_id, clue, session, value, transform_index=None, transform_
     if input_mode == "tap_words":
         correct = set(value) == set(expected)
     elif input_mode == "text":
-        user_text = re.sub(r'[^A-Z]', '', str(value).upper())
-        expected_text = re.sub(r'[^A-Z]', '', str(expected).upper())
+        user_text = _NON_UPPER_RE.sub('', str(value).upper())
+        expected_text = _NON_UPPER_RE.sub('', str(expected).upper())
         correct = user_text == expected_text
     elif input_mode == "multiple_choice":
         correct = str(value).strip().lower() == str(expected).strip().lower()
@@ -450,7 +497,7 @@ def update_ui_state(clue_id, clue, session, action, data):
                 session["selected_indices"].append(index)
 
     elif action == "type_answer":
-        session["user_answer"] = data.get("letters", [])
+        session["user_answer"] = _pack_answer(data.get("letters", []))
 
     elif action == "expand_step":
         session["step_expanded"] = True
@@ -512,7 +559,7 @@ def reveal_answer(clue_id, clue, session):
             })
 
     # Populate answer boxes
-    answer_letters = list(re.sub(r'[^A-Z]', '', clue["answer"].upper()))
+    answer_letters = _NON_UPPER_RE.sub('', clue["answer"].upper())
     session["user_answer"] = answer_letters
 
     return get_render(clue_id, clue, session)
@@ -520,8 +567,8 @@ def reveal_answer(clue_id, clue, session):
 
 def check_answer(clue_id, clue, session, answer):
     """Check if the typed answer matches. Returns {correct, render}."""
-    user_text = re.sub(r'[^A-Z]', '', str(answer).upper())
-    expected_text = re.sub(r'[^A-Z]', '', clue["answer"].upper())
+    user_text = _NON_UPPER_RE.sub('', str(answer).upper())
+    expected_text = _NON_UPPER_RE.sub('', clue["answer"].upper())
     feedback = RENDER_TEMPLATES["feedback"]
 
     if user_text == expected_text:
@@ -531,6 +578,68 @@ def check_answer(clue_id, clue, session, answer):
         return {"correct": False, "message": feedback["answer_incorrect"], "render": get_render(clue_id, clue, session)}
 
 
+# Batchable operations: route path -> handler taking (clue_id, clue, session, op payload).
+# Each returns exactly what the single-request route would.
+_BATCH_OPS = {
+    "/input": lambda clue_id, clue, session, data: handle_input(
+        clue_id, clue, session, value=data.get("value"),
+        transform_index=data.get("transform_index"),
+        transform_inputs=data.get("transform_inputs"),
+        letter_positions=data.get("letter_positions")),
+    "/ui-state": lambda clue_id, clue, session, data: update_ui_state(
+        clue_id, clue, session, data.get("action"), data),
+    "/reveal": lambda clue_id, clue, session, data: reveal_answer(clue_id, clue, session),
+    "/check-answer": lambda clue_id, clue, session, data: check_answer(
+        clue_id, clue, session, data.get("answer", "")),
+}
+
+# Route paths handle_batch accepts as ops
+BATCH_OP_PATHS = frozenset(_BATCH_OPS)
+
+# /input payload keys that only apply to the assembly step
+_ASSEMBLY_INPUT_KEYS = ("transform_index", "transform_inputs", "letter_positions")
+
+
+def max_batch_ops(clue):
+    """Largest ops list /batch accepts for clue: one per step plus one per transform."""
+    return len(clue["steps"]) + sum(len(step.get("transforms", [])) for step in clue["steps"])
+
+
+def handle_batch(clue_id, clue, session, ops):
+    """Apply ops ([{path, payload}]) in order, threading the session through.
+
+    Returns the list of per-op responses, each identical to what the matching
+    single route returns for that step.
+
+    Ops must already be validated by the caller: each a dict whose "path" is in
+    BATCH_OP_PATHS and whose "payload" is a dict. Handler errors propagate as
+    they do on the single-op routes.
+
+    Stops at the first /input op that no longer has a step to act on — the
+    clue is complete, or it is an assembly op (transform_index, transform_inputs
+    or letter_positions) and the assembly step is done — and returns the
+    results so far, so callers can send inputs planned before an earlier op
+    auto-completed the clue.
+    """
+    steps = clue["steps"]
+    results = []
+    for op in ops:
+        if op["path"] == "/input":
+            step_index = session["step_index"]
+            if step_index >= len(steps):
+                break
+            payload = op["payload"]
+            is_assembly_op = any(payload.get(k) is not None for k in _ASSEMBLY_INPUT_KEYS)
+            step_mode = RENDER_TEMPLATES.get(steps[step_index]["type"], {}).get("inputMode")
+            if is_assembly_op and step_mode != "assembly":
+                break
+        # Each response carries its own signed session snapshot; handlers mutate
+        # the session in place, so the next op must work on a copy.
+        session = copy.deepcopy(session)
+        results.append(_BATCH_OPS[op["path"]](clue_id, clue, session, op["payload"]))
+    return results
+
+
 # --- Internal helpers ---
 
 
@@ -603,8 +712,8 @@ def _build_transform_list(transforms, transforms_done, template, clue, words,
     transform_list = []
     for i, t in enumerate(transforms):
         clue_word = " ".join(words[idx] for idx in t["indices"])
-        letter_count = len(re.sub(r'[^A-Z]', '', t["result"].upper()))
-        word_letter_count = len(re.sub(r'[^A-Za-z]', '', clue_word))
+        letter_count = len(_NON_UPPER_RE.sub('', t["result"].upper()))
+        word_letter_count = len(_NON_ALPHA_RE.sub('', clue_word))
         if "type" not in t:
             raise ValueError(f"Transform {i} is missing 'type' field in assembly step")
         t_type = t["type"]
@@ -817,6 +926,13 @@ def _build_assembly_data(session, step, clue):
     # Extract data from earlier steps (needed for transform prompts and abbreviation auto-complete)
     prior = _extract_prior_step_data(clue, words)
 
+    # Indicator types in step order — one scan of the clue's steps, shared by
+    # every clue-shape detector below
+    indicator_types = [
+        s.get("indicator_type") for s in clue.get("steps", [])
+        if s.get("type") == "indicator"
+    ]
+
     # Straight anagram detection: exactly 2 transforms (literal → anagram), clue_type is 'anagram'.
     # Auto-complete the literal so the student sees only coaching text + letter boxes.
     is_straight_anagram = (
@@ -832,10 +948,7 @@ def _build_assembly_data(session, step, clue):
 
     # Simple hidden word detection: exactly 1 transform (letter_selection), clue has a hidden_word indicator.
     # The student sees only coaching text + letter boxes — no transform prompts.
-    has_hidden_word_indicator = any(
-        s.get("type") == "indicator" and s.get("indicator_type") == "hidden_word"
-        for s in clue.get("steps", [])
-    )
+    has_hidden_word_indicator = "hidden_word" in indicator_types
     is_simple_hidden_word = (
         has_hidden_word_indicator
         and len(transforms) == 1
@@ -847,10 +960,7 @@ def _build_assembly_data(session, step, clue):
     # Simple substitution detection: exactly 2 transforms (literal source + substitution),
     # clue has a substitution indicator. Auto-complete the literal so the student sees
     # only coaching text + letter boxes.
-    has_substitution_indicator = any(
-        s.get("type") == "indicator" and s.get("indicator_type") == "substitution"
-        for s in clue.get("steps", [])
-    )
+    has_substitution_indicator = "substitution" in indicator_types
     is_simple_substitution = (
         has_substitution_indicator
         and len(transforms) == 2
@@ -867,10 +977,7 @@ def _build_assembly_data(session, step, clue):
     # abbreviation, etc.). The coaching paragraph replaces definition + indicator +
     # fail message. The container transform is visible — the student completes the
     # insertion step themselves.
-    has_container_indicator = any(
-        s.get("type") == "indicator" and s.get("indicator_type") == "container"
-        for s in clue.get("steps", [])
-    )
+    has_container_indicator = "container" in indicator_types
     container_transform_indices = [
         i for i, t in enumerate(transforms) if t["type"] == "container"
     ]
@@ -887,9 +994,7 @@ def _build_assembly_data(session, step, clue):
 
     # Pure charade detection: no indicator steps at all, all transforms are
     # synonyms/abbreviations/literals with part roles (part1, part2, etc.)
-    has_any_indicators = any(
-        s.get("type") == "indicator" for s in clue.get("steps", [])
-    )
+    has_any_indicators = bool(indicator_types)
     charade_transform_types = {"synonym", "abbreviation", "literal"}
     is_pure_charade = (
         not has_any_indicators
@@ -902,10 +1007,6 @@ def _build_assembly_data(session, step, clue):
     # Charade with single indicator detection: exactly one indicator (deletion or
     # reversal), no container transform, transforms include the indicator type
     # plus synonyms/abbreviations/literals.
-    indicator_types = [
-        s.get("indicator_type") for s in clue.get("steps", [])
-        if s.get("type") == "indicator"
-    ]
     charade_with_indicator_types = {"synonym", "abbreviation", "literal", "deletion", "reversal", "letter_selection"}
     is_deletion_charade = (
         indicator_types == ["deletion"]
@@ -1025,7 +1126,7 @@ def _build_assembly_data(session, step, clue):
     result_groups = _compute_result_groups(position_map, step, completed_letters, transforms_done, session.get("cross_letters"), session.get("combined_letters", {}))
 
     # Determine phase: check when completed letters spell the answer but auto-skip didn't fire
-    final_result = re.sub(r'[^A-Z]', '', step["result"].upper())
+    final_result = _NON_UPPER_RE.sub('', step["result"].upper())
     assembled = "".join(l for l in completed_letters if l)
     phase = "check" if assembled == final_result else "transforms"
 
@@ -1072,7 +1173,7 @@ def _build_assembly_data(session, step, clue):
             if t["type"] not in DEPENDENT_TRANSFORM_TYPES:
                 t_word = " ".join(words[idx] for idx in t["indices"])
                 independent_words.append(t_word)
-                raw_letter_total += len(re.sub(r'[^A-Za-z]', '', t_word))
+                raw_letter_total += len(_NON_ALPHA_RE.sub('', t_word))
         virtual_step["rawLetterTotal"] = str(raw_letter_total)
         if len(independent_words) == 1:
             virtual_step["remainingWordsList"] = "'" + independent_words[0] + "'"
@@ -1253,8 +1354,8 @@ def _handle_assembly_input(session, step, clue, clue_id, value, transform_index=
     if transform_index is not None and 0 <= transform_index < len(transforms):
         # Transform submission: validate against this specific transform
         expected = transforms[transform_index]["result"]
-        user_text = re.sub(r'[^A-Z]', '', str(value).upper())
-        expected_text = re.sub(r'[^A-Z]', '', expected.upper())
+        user_text = _NON_UPPER_RE.sub('', str(value).upper())
+        expected_text = _NON_UPPER_RE.sub('', expected.upper())
 
         if user_text == expected_text:
             transforms_done[transform_index] = expected.upper()
@@ -1281,7 +1382,7 @@ def _handle_assembly_input(session, step, clue, clue_id, value, transform_index=
             # Auto-skip: do the completed letters spell the answer?
             position_map = _compute_position_map(step)
             completed_letters = _compute_completed_letters(transforms_done, position_map, step)
-            final_result = re.sub(r'[^A-Z]', '', step["result"].upper())
+            final_result = _NON_UPPER_RE.sub('', step["result"].upper())
             assembled = "".join(l for l in completed_letters if l)
 
             if assembled == final_result:
@@ -1295,7 +1396,7 @@ def _handle_assembly_input(session, step, clue, clue_id, value, transform_index=
                     session["assembly_hint_index"] = None
                     # Lock the answer and populate answer boxes
                     session["answer_locked"] = True
-                    answer_letters = list(re.sub(r'[^A-Z]', '', clue["answer"].upper()))
+                    answer_letters = _NON_UPPER_RE.sub('', clue["answer"].upper())
                     session["user_answer"] = answer_letters
 
             return {"correct": True, "message": feedback["step_correct"], "render": get_render(clue_id, clue, session)}
@@ -1306,8 +1407,8 @@ def _handle_assembly_input(session, step, clue, clue_id, value, transform_index=
         # Check phase: validate the full assembled result
 
         expected = step["result"]
-        user_text = re.sub(r'[^A-Z]', '', str(value).upper())
-        expected_text = re.sub(r'[^A-Z]', '', expected.upper())
+        user_text = _NON_UPPER_RE.sub('', str(value).upper())
+        expected_text = _NON_UPPER_RE.sub('', expected.upper())
 
         if user_text == expected_text:
             step_index = session["step_index"]
@@ -1320,7 +1421,7 @@ def _handle_assembly_input(session, step, clue, clue_id, value, transform_index=
             session["assembly_hint_index"] = None
             # Lock the answer and populate answer boxes
             session["answer_locked"] = True
-            answer_letters = list(re.sub(r'[^A-Z]', '', clue["answer"].upper()))
+            answer_letters = _NON_UPPER_RE.sub('', clue["answer"].upper())
             session["user_answer"] = answer_letters
             return {"correct": True, "message": feedback["step_correct"], "render": get_render(clue_id, clue, session)}
         else:
@@ -1348,7 +1449,7 @@ def _compute_position_map(step):
     Non-container terminals are laid out left-to-right (charade order).
     """
     transforms = step["transforms"]
-    result = re.sub(r'[^A-Z]', '', step["result"].upper())
+    result = _NON_UPPER_RE.sub('', step["result"].upper())
 
     # Identify terminal transforms (those not superseded by a later dependent)
     terminal = find_terminal_transforms(transforms)
@@ -1372,10 +1473,10 @@ def _compute_position_map(step):
             # Expand container into outer/inner sub-groups
             sub_map = _expand_container_terminal(transforms, terminal, idx, pos)
             position_map.update(sub_map)
-            container_len = len(re.sub(r'[^A-Z]', '', t["result"].upper()))
+            container_len = len(_NON_UPPER_RE.sub('', t["result"].upper()))
             pos += container_len
         else:
-            t_result = re.sub(r'[^A-Z]', '', t["result"].upper())
+            t_result = _NON_UPPER_RE.sub('', t["result"].upper())
             position_map[idx] = list(range(pos, pos + len(t_result)))
             pos += len(t_result)
     return position_map
@@ -1404,7 +1505,7 @@ def _expand_container_terminal(transforms, terminal, container_idx, offset):
         elif effective_role == "inner" or effective_role.startswith("inner_"):
             inner_indices.append(i)
 
-    container_result = re.sub(r'[^A-Z]', '', transforms[container_idx]["result"].upper())
+    container_result = _NON_UPPER_RE.sub('', transforms[container_idx]["result"].upper())
 
     # If role-based classification didn't find outer/inner (e.g. sub-container
     # in a charade using part roles), determine from letter pattern matching:
@@ -1412,7 +1513,7 @@ def _expand_container_terminal(transforms, terminal, container_idx, offset):
     if not outer_indices or not inner_indices:
         from itertools import permutations as _perms
         input_results = {
-            i: re.sub(r'[^A-Z]', '', transforms[i]["result"].upper())
+            i: _NON_UPPER_RE.sub('', transforms[i]["result"].upper())
             for i in direct_inputs
         }
         found = False
@@ -1441,11 +1542,11 @@ def _expand_container_terminal(transforms, terminal, container_idx, offset):
 
     # Combine all outer parts into one result string (multi-part outers: outer_a + outer_b)
     outer_result = "".join(
-        re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper())
+        _NON_UPPER_RE.sub('', transforms[idx]["result"].upper())
         for idx in outer_indices
     )
     combined_inner = "".join(
-        re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper())
+        _NON_UPPER_RE.sub('', transforms[idx]["result"].upper())
         for idx in inner_indices
     )
 
@@ -1462,13 +1563,13 @@ def _expand_container_terminal(transforms, terminal, container_idx, offset):
                 # Distribute outer positions among outer pieces (same pattern as inner)
                 outer_pos_cursor = 0
                 for idx in outer_indices:
-                    piece_len = len(re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper()))
+                    piece_len = len(_NON_UPPER_RE.sub('', transforms[idx]["result"].upper()))
                     position_map[idx] = outer_positions[outer_pos_cursor:outer_pos_cursor + piece_len]
                     outer_pos_cursor += piece_len
                 # Each inner transform gets its slice
                 inner_pos = offset + insert_pos
                 for idx in inner_indices:
-                    inner_len = len(re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper()))
+                    inner_len = len(_NON_UPPER_RE.sub('', transforms[idx]["result"].upper()))
                     position_map[idx] = list(range(inner_pos, inner_pos + inner_len))
                     inner_pos += inner_len
                 return position_map
@@ -1502,11 +1603,11 @@ def _expand_implicit_container(transforms, terminal, result):
 
     # Combine all outer parts (multi-part outers: outer_a + outer_b)
     outer_result = "".join(
-        re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper())
+        _NON_UPPER_RE.sub('', transforms[idx]["result"].upper())
         for idx in outer_indices
     )
     combined_inner = "".join(
-        re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper())
+        _NON_UPPER_RE.sub('', transforms[idx]["result"].upper())
         for idx in inner_indices
     )
 
@@ -1522,12 +1623,12 @@ def _expand_implicit_container(transforms, terminal, result):
                 # Distribute outer positions among outer pieces
                 outer_pos_cursor = 0
                 for idx in outer_indices:
-                    piece_len = len(re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper()))
+                    piece_len = len(_NON_UPPER_RE.sub('', transforms[idx]["result"].upper()))
                     position_map[idx] = outer_positions[outer_pos_cursor:outer_pos_cursor + piece_len]
                     outer_pos_cursor += piece_len
                 inner_pos = insert_pos
                 for idx in inner_indices:
-                    inner_len = len(re.sub(r'[^A-Z]', '', transforms[idx]["result"].upper()))
+                    inner_len = len(_NON_UPPER_RE.sub('', transforms[idx]["result"].upper()))
                     position_map[idx] = list(range(inner_pos, inner_pos + inner_len))
                     inner_pos += inner_len
                 return position_map
@@ -1583,7 +1684,7 @@ def _compute_result_groups(position_map, step, completed_letters, transforms_don
     - isEditable: False when letter is filled or the position's transform is done
     - crossLetter: letter from crossing word at this position (string or "")
     """
-    result = re.sub(r'[^A-Z]', '', step["result"].upper())
+    result = _NON_UPPER_RE.sub('', step["result"].upper())
     total_positions = len(result)
 
     # Build cross-letter lookup: position → letter
@@ -1639,12 +1740,12 @@ def _compute_result_groups(position_map, step, completed_letters, transforms_don
 
 def _compute_completed_letters(transforms_done, position_map, step):
     """Build the partially-filled answer array from completed transforms."""
-    result = re.sub(r'[^A-Z]', '', step["result"].upper())
+    result = _NON_UPPER_RE.sub('', step["result"].upper())
     letters = [None] * len(result)
 
     for idx, transform_result in transforms_done.items():
         if idx in position_map:
-            clean_result = re.sub(r'[^A-Z]', '', transform_result.upper())
+            clean_result = _NON_UPPER_RE.sub('', transform_result.upper())
             for i, pos in enumerate(position_map[idx]):
                 if i < len(clean_result) and pos < len(letters):
                     letters[pos] = clean_result[i]
@@ -1761,21 +1862,31 @@ def _get_transform_results(steps, completed_steps):
     return {}
 
 
-def _build_all_done(session, clue, clue_id):
-    """Build the render when all steps are completed. Same layout, no currentStep."""
-    # Populate answer boxes if not already filled
-    if not session["user_answer"]:
-        answer_letters = list(re.sub(r'[^A-Z]', '', clue["answer"].upper()))
-        session["user_answer"] = answer_letters
+@functools.lru_cache(maxsize=4096)
+def _compute_answer_groups(enum_str):
+    """Compute answer box groups from an enumeration: commas separate words,
+    hyphens join within a word. "5-6" → (11,), "5,3" → (5, 3), "7" → (7,)
 
-    # Compute answer box groups from enumeration (same logic as get_render)
-    enum_str = clue.get("enumeration", "")
+    Cached per enumeration string — every render of a clue reuses the result.
+    Returns a tuple so the shared cached value can't be mutated.
+    """
     answer_groups = []
-    for part in re.split(r'[,\s]+', enum_str):
+    for part in _ENUM_SPLIT_RE.split(enum_str):
         if part:
             total = sum(int(n) for n in part.split('-') if n.isdigit())
             if total > 0:
                 answer_groups.append(total)
+    return tuple(answer_groups)
+
+
+def _build_all_done(session, clue, clue_id):
+    """Build the render when all steps are completed. Same layout, no currentStep."""
+    # Populate answer boxes if not already filled
+    if not session["user_answer"]:
+        answer_letters = _NON_UPPER_RE.sub('', clue["answer"].upper())
+        session["user_answer"] = answer_letters
+
+    answer_groups = _compute_answer_groups(clue.get("enumeration", ""))
 
     return {
         "clue_id": clue_id,
@@ -1790,27 +1901,25 @@ def _build_all_done(session, clue, clue_id):
         "helpText": "",
         "highlights": session["highlights"],
         "selectedIndices": [],
-        "userAnswer": session["user_answer"],
+        "userAnswer": _unpack_answer(session["user_answer"]),
         "answerLocked": session["answer_locked"],
         "complete": True,
         "session": _sign_session(session),
     }
 
 
+# Closed set of expected_source values — each names the step field holding the answer
+_EXPECTED_SOURCES = frozenset({"indices", "result", "expected"})
+
+
 def _resolve_expected(step, template):
     """Get the expected answer for validation from the step data."""
     source = template.get("expected_source")
     if not source:
         raise ValueError(f"No expected_source in template for {step['type']}")
-
-    if source == "indices":
-        return step["indices"]
-    elif source == "result":
-        return step["result"]
-    elif source == "expected":
-        return step["expected"]
-    else:
+    if source not in _EXPECTED_SOURCES:
         raise ValueError(f"Unknown expected_source: {source}")
+    return step[source]
 
 
 def _get_dict_key(step):
@@ -1881,30 +1990,33 @@ def _resolve_simple_variables(text, step, clue):
     return text
 
 
+# Assembly context placeholders → virtual-step field, as (placeholder, field) pairs
+_ASSEMBLY_CONTEXT_VARIABLES = (
+    ("{definitionWords}", "definitionWords"),
+    ("{indicatorHint}", "indicatorHint"),
+    ("{indicatorWords}", "indicatorWords"),
+    ("{innerWords}", "innerWords"),
+    ("{outerWords}", "outerWords"),
+    ("{abbreviationSummary}", "abbreviationSummary"),
+    ("{sourceWord}", "sourceWord"),
+    ("{fodderWord}", "fodderWord"),
+    ("{fodderWordUpper}", "fodderWordUpper"),
+    ("{containerIndicatorWords}", "containerIndicatorWords"),
+    ("{reversalIndicatorWords}", "reversalIndicatorWords"),
+    ("{deletionIndicatorWords}", "deletionIndicatorWords"),
+    ("{letterSelectionIndicatorWords}", "letterSelectionIndicatorWords"),
+    ("{anagramIndicatorWords}", "anagramIndicatorWords"),
+    ("{homophoneIndicatorWords}", "homophoneIndicatorWords"),
+    ("{orderingIndicatorWords}", "orderingIndicatorWords"),
+    ("{hiddenWordIndicatorWords}", "hiddenWordIndicatorWords"),
+    ("{rawLetterTotal}", "rawLetterTotal"),
+    ("{remainingWordsList}", "remainingWordsList"),
+)
+
+
 def _resolve_assembly_context_variables(text, step):
     """Resolve assembly-specific context variables injected via virtual step."""
-    variable_map = {
-        "{definitionWords}": "definitionWords",
-        "{indicatorHint}": "indicatorHint",
-        "{indicatorWords}": "indicatorWords",
-        "{innerWords}": "innerWords",
-        "{outerWords}": "outerWords",
-        "{abbreviationSummary}": "abbreviationSummary",
-        "{sourceWord}": "sourceWord",
-        "{fodderWord}": "fodderWord",
-        "{fodderWordUpper}": "fodderWordUpper",
-        "{containerIndicatorWords}": "containerIndicatorWords",
-        "{reversalIndicatorWords}": "reversalIndicatorWords",
-        "{deletionIndicatorWords}": "deletionIndicatorWords",
-        "{letterSelectionIndicatorWords}": "letterSelectionIndicatorWords",
-        "{anagramIndicatorWords}": "anagramIndicatorWords",
-        "{homophoneIndicatorWords}": "homophoneIndicatorWords",
-        "{orderingIndicatorWords}": "orderingIndicatorWords",
-        "{hiddenWordIndicatorWords}": "hiddenWordIndicatorWords",
-        "{rawLetterTotal}": "rawLetterTotal",
-        "{remainingWordsList}": "remainingWordsList",
-    }
-    for placeholder, field in variable_map.items():
+    for placeholder, field in _ASSEMBLY_CONTEXT_VARIABLES:
         if placeholder in text:
             if field not in step:
                 raise ValueError(f"Template uses {placeholder} but step is missing '{field}'")
@@ -2007,13 +2119,13 @@ def _resolve_container_breakdown(transforms, step, clue, independent_tpl,
         raise ValueError("Container clue has outer/inner roles but no terminal outer or inner transforms found")
 
     # Combine outer parts (single outer or multi-part outer_a + outer_b)
-    outer_result = "".join(re.sub(r'[^A-Z]', '', p[1]) for p in outer_parts)
-    combined_inner = "".join(re.sub(r'[^A-Z]', '', p[1]) for p in inner_parts)
+    outer_result = "".join(_NON_UPPER_RE.sub('', p[1]) for p in outer_parts)
+    combined_inner = "".join(_NON_UPPER_RE.sub('', p[1]) for p in inner_parts)
     # Use the container transform's result for position matching
     if container_idx is not None:
-        container_result = re.sub(r'[^A-Z]', '', transforms[container_idx]["result"].upper())
+        container_result = _NON_UPPER_RE.sub('', transforms[container_idx]["result"].upper())
     else:
-        container_result = re.sub(r'[^A-Z]', '', step["result"].upper())
+        container_result = _NON_UPPER_RE.sub('', step["result"].upper())
 
     # Find where inner sits inside outer
     inner_display = part_joiner.join(p[1] for p in inner_parts)
@@ -2102,6 +2214,15 @@ def _resolve_charade_breakdown(transforms, clue, independent_tpl, dependent_tpl,
     return part_joiner.join(d for d, _ in parts)
 
 
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+
+@functools.lru_cache(maxsize=None)
+def _template_fields(text):
+    """Parse a template string once into the frozenset of {variable} names it uses."""
+    return frozenset(_PLACEHOLDER_RE.findall(text))
+
+
 def _resolve_variables(text, step, clue):
     """Replace {variable} placeholders in a template string.
 
@@ -2109,8 +2230,9 @@ def _resolve_variables(text, step, clue):
     """
     if text is None:
         raise ValueError("_resolve_variables received None — template field is missing")
-    if text == "":
-        return ""
+    # Plain text (no placeholders) needs no substitution passes
+    if not _template_fields(text):
+        return text
 
     text = _resolve_simple_variables(text, step, clue)
     text = _resolve_assembly_context_variables(text, step)
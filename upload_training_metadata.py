@@ -18,6 +18,7 @@ Usage:
     python3 upload_training_metadata.py --clue times-29147-1d --dry-run
 """
 
+import functools
 import json
 import re
 import sys
@@ -30,6 +31,7 @@ from puzzle_store_supabase import PuzzleStoreSupabase
 from validate_training import validate_training_item
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_training_id(item_id):
     """
     Parse a training item ID into its components.
@@ -286,21 +286,24 @@ VALID_PROFILES = {"simple_anagram", "simple_hidden_word", "simple_substitution",
 # Indicator type equivalences (hidden_word covers reversal)
 INDICATOR_EQUIVALENCES = {"hidden_word": {"reversal", "hidden_word"}}
 
+# Required top-level fields per training item
+ITEM_REQUIRED_FIELDS = frozenset({"clue", "number", "enumeration", "answer", "words", "clue_type", "difficulty", "steps"})
+
 # Required fields per step type
 STEP_REQUIRED_FIELDS = {
-    "definition": ["indices", "hint"],
-    "wordplay_type": ["expected", "options", "hint"],
-    "indicator": ["indices", "hint", "indicator_type"],
-    "fodder": ["indices", "indicator_type", "hint"],
-    "multi_definition": ["indices", "hint", "definition_part"],
-    "abbreviation_scan": ["indices", "hint", "mappings"],
-    "outer_word": ["indices"],
-    "inner_word": ["indices"],
-    "assembly": ["transforms", "result"],
+    "definition": frozenset({"indices", "hint"}),
+    "wordplay_type": frozenset({"expected", "options", "hint"}),
+    "indicator": frozenset({"indices", "hint", "indicator_type"}),
+    "fodder": frozenset({"indices", "indicator_type", "hint"}),
+    "multi_definition": frozenset({"indices", "hint", "definition_part"}),
+    "abbreviation_scan": frozenset({"indices", "hint", "mappings"}),
+    "outer_word": frozenset({"indices"}),
+    "inner_word": frozenset({"indices"}),
+    "assembly": frozenset({"transforms", "result"}),
 }
 
 # Required fields per transform
-TRANSFORM_REQUIRED_FIELDS = ["role", "indices", "type", "result", "hint"]
+TRANSFORM_REQUIRED_FIELDS = frozenset({"role", "indices", "type", "result", "hint"})
 
 
 # ---------------------------------------------------------------------------
@@ -761,10 +764,8 @@ def validate_training_item(item_id, item):
     publication = _extract_publication(item_id)
 
     # --- 1. Required top-level fields ---
-    required_fields = ["clue", "number", "enumeration", "answer", "words", "clue_type", "difficulty", "steps"]
-    for field in required_fields:
-        if field not in item:
-            errors.append(f"Missing required field: '{field}'")
+    for field in sorted(ITEM_REQUIRED_FIELDS - item.keys()):
+        errors.append(f"Missing required field: '{field}'")
 
     # If critical fields missing, can't proceed with further checks
     if "words" not in item or "steps" not in item or "answer" not in item:
@@ -816,9 +817,8 @@ def validate_training_item(item_id, item):
 
         # --- 6. Step-specific required fields ---
         if step_type in STEP_REQUIRED_FIELDS:
-            for field in STEP_REQUIRED_FIELDS[step_type]:
-                if field not in step:
-                    errors.append(f"Step {i} ({step_type}): missing required field '{field}'")
+            for field in sorted(STEP_REQUIRED_FIELDS[step_type] - step.keys()):
+                errors.append(f"Step {i} ({step_type}): missing required field '{field}'")
 
         # --- 13. Indicator type valid ---
         if step_type == "indicator" and "indicator_type" in step:
@@ -867,9 +867,8 @@ def validate_training_item(item_id, item):
             # Validate each transform
             for ti, transform in enumerate(transforms):
                 # --- 9. Transform required fields ---
-                for field in TRANSFORM_REQUIRED_FIELDS:
-                    if field not in transform:
-                        errors.append(f"Step {i}, transform {ti}: missing required field '{field}'")
+                for field in sorted(TRANSFORM_REQUIRED_FIELDS - transform.keys()):
+                    errors.append(f"Step {i}, transform {ti}: missing required field '{field}'")
 
                 if "type" not in transform or "result" not in transform:
                     continue